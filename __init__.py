@@ -1,5 +1,3 @@
-from . import main
-
 bl_info = {
     "name": "Santouka Tools",
     "blender": (3, 5, 0),
@@ -13,11 +11,15 @@ bl_info = {
 }
 
 
+# NOTE: main (and bpy) is imported on register only,
+# batch worker processes import this package without bpy.
 def register():
+    from . import main
     main.addon_register()
 
 
 def unregister():
+    from . import main
     main.addon_unregister()
 
 # For testing in Blender's Text Editor
@@ -0,0 +1,139 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Check many objects at once.
+#
+# Mesh arrays of every object are sent to a pool of worker processes
+# running the pure NumPy checks from mesh_arrays, thickness included
+# (mesh_arrays.check_thick()), Blender only reads the meshes and stores
+# the results.
+
+
+import os
+
+from . import (
+    cache,
+    mesh_arrays,
+    mesh_helpers,
+    operators,
+    report,
+)
+
+# Scene properties sent to the workers.
+_PROPS = (
+    "threshold_zero",
+    "angle_distort",
+    "thickness_min",
+    "angle_sharp",
+    "angle_overhang",
+)
+
+
+def _pool(max_workers):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Fork is not safe from inside Blender.
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def check_objects(objects, check_cls, stk_tools_props, max_workers=None):
+    """
+    Run ``check_cls`` on every object, update their reports and the batch summary.
+
+    Objects are read and submitted one at a time with at most two jobs per
+    worker in flight, so memory doesn't grow with the selection. A job
+    whose worker fails is checked in Blender instead.
+
+    Returns the summary rows, see report.batch_update().
+    """
+    from collections import deque
+
+    props = {name: getattr(stk_tools_props, name) for name in _PROPS}
+
+    def finish(job):
+        obj, snapshot, keys, cached, future = job
+
+        results = None
+        if None in cached:
+            if future is not None:
+                try:
+                    results = future.result()
+                except Exception as ex:
+                    print(f"batch check: worker failed on {obj.name!r} ({ex!r}), checking in Blender")
+            if results is None:
+                results = mesh_arrays.check_arrays(
+                    snapshot.arrays, snapshot.co_world, props)
+
+        if results is None:
+            mass = mesh_arrays.mass_properties(
+                snapshot.co_world, snapshot.arrays.tri_verts)
+        else:
+            mass = results["mass"]
+
+        infos = []
+        counts = {}
+        for cls, key, cls_info in zip(check_cls, keys, cached):
+            if cls_info is None:
+                cls_info = []
+                cls.append_info(cls_info, results[cls.check_name])
+                cache.put(key, cls_info)
+            infos.append(cls_info)
+            counts[cls.check_name] = sum(
+                len(data[1]) for _text, data in cls_info if data)
+
+        operators.store_results(
+            obj, check_cls, infos, stk_tools_props, fingerprint=snapshot.fingerprint)
+        snapshot.free()
+
+        return {
+            "name": obj.name,
+            "issues": sum(counts.values()),
+            "counts": counts,
+            "volume": abs(mass.volume),
+            "area": mass.area,
+        }
+
+    max_workers = min(len(objects), max_workers or os.cpu_count() or 1)
+    pool = None
+    if max_workers > 1:
+        try:
+            pool = _pool(max_workers)
+        except Exception as ex:
+            print(f"batch check: worker processes failed ({ex!r}), checking in Blender")
+
+    rows = []
+    pending = deque()
+    try:
+        for obj in objects:
+            snapshot = mesh_helpers.MeshSnapshot(obj)
+            keys = [
+                cache.check_key(cls, obj, snapshot.fingerprint, stk_tools_props)
+                for cls in check_cls
+            ]
+            cached = [cache.get(key) for key in keys]
+
+            future = None
+            if pool is not None and None in cached:
+                try:
+                    future = pool.submit(
+                        mesh_arrays.check_arrays, snapshot.arrays, snapshot.co_world, props)
+                except Exception as ex:
+                    print(f"batch check: worker processes failed ({ex!r}), checking in Blender")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = None
+
+            pending.append((obj, snapshot, keys, cached, future))
+            while len(pending) >= 2 * max_workers:
+                rows.append(finish(pending.popleft()))
+
+        while pending:
+            rows.append(finish(pending.popleft()))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    report.batch_update(rows)
+    return rows
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# World space bounding boxes of objects, for panels redrawing all the time.
+#
+# Boxes of many objects are computed at once from their bound_box corners
+# and cached by object, mesh, bound_box corners and world matrix, so any
+# change of the box shows in the key. Entries of changed objects are also
+# dropped from the depsgraph handler, and code changing mesh data itself
+# calls invalidate(), to not keep boxes of removed objects around.
+
+
+import numpy as np
+
+# object name -> (key, (2, 3) min/max array), see _key()
+_entries = {}
+
+
+def _key(obj):
+    data = obj.data
+    return (
+        # Pointers tell apart objects and meshes re-created with the same names.
+        obj.as_pointer(),
+        data.name if data else None,
+        data.as_pointer() if data else 0,
+        # The local box the world box is computed from, changes with any
+        # geometry edit that moves the bounds.
+        tuple(map(tuple, obj.bound_box)),
+        tuple(map(tuple, obj.matrix_world)),
+    )
+
+
+def world_bounds(objects):
+    """Return a (len(objects), 2, 3) array of world space (min, max) corners."""
+    ret = np.empty((len(objects), 2, 3))
+    todo = []
+
+    for i, obj in enumerate(objects):
+        key = _key(obj)
+        entry = _entries.get(obj.name)
+        if entry is not None and entry[0] == key:
+            ret[i] = entry[1]
+        else:
+            todo.append((i, obj, key))
+
+    if todo:
+        corners = np.array([key[-2] for _i, _obj, key in todo])
+        matrices = np.array([key[-1] for _i, _obj, key in todo])
+        corners = (
+            np.einsum("nij,nkj->nki", matrices[:, :3, :3], corners) +
+            matrices[:, np.newaxis, :3, 3]
+        )
+        boxes = np.stack((corners.min(axis=1), corners.max(axis=1)), axis=1)
+        for (i, obj, key), box in zip(todo, boxes):
+            box.flags.writeable = False
+            _entries[obj.name] = (key, box)
+            ret[i] = box
+
+    return ret
+
+
+def world_bound(obj):
+    """Return (min_x, max_x, min_y, max_y, min_z, max_z) of one object."""
+    box = world_bounds((obj,))[0]
+    return tuple(box.T.ravel().tolist())
+
+
+def invalidate(names):
+    """Drop boxes of objects or meshes with any of these names."""
+    for name in [
+            name for name, entry in _entries.items()
+            if name in names or entry[0][1] in names
+    ]:
+        del _entries[name]
+
+
+def clear():
+    _entries.clear()
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Cache of check results, so unchanged meshes are not analysed again.
+#
+# Entries are keyed by check, object, mesh, geometry fingerprint,
+# world matrix and the scene properties the check reads.
+# Least recently used entries are dropped past the memory budget.
+
+
+from collections import OrderedDict
+
+BUDGET_BYTES = 256 * 1024 * 1024
+
+# key -> (info, size in bytes)
+_entries = OrderedDict()
+_size = 0
+# names whose next update leaves the geometry unchanged, see hold()
+_held = set()
+
+
+def _info_size(info):
+    size = 0
+    for _text, data in info:
+        if data and data[1] is not None:
+            elems = data[1]
+            size += len(elems) * getattr(elems, "itemsize", 8)
+    return size
+
+
+def check_key(check_cls, obj, fingerprint, props):
+    return (
+        check_cls.bl_idname,
+        obj.name,
+        obj.data.name,
+        fingerprint,
+        tuple(map(tuple, obj.matrix_world)),
+        tuple(getattr(props, name) for name in check_cls.check_props),
+    )
+
+
+def get(key):
+    """Return the cached info list or None."""
+    item = _entries.get(key)
+    if item is None:
+        return None
+    _entries.move_to_end(key)
+    return item[0]
+
+
+def put(key, info):
+    global _size
+
+    if key in _entries:
+        _size -= _entries.pop(key)[1]
+
+    size = _info_size(info)
+    _entries[key] = (info, size)
+    _size += size
+
+    while _size > BUDGET_BYTES and len(_entries) > 1:
+        _key, (_info, size_old) = _entries.popitem(last=False)
+        _size -= size_old
+
+
+def hold(names):
+    """Keep the entries of these names through their next invalidate()."""
+    _held.update(names)
+
+
+def invalidate(names):
+    """Drop entries of objects or meshes with any of these names."""
+    global _size
+
+    held = _held.intersection(names)
+    if held:
+        # Our own update (e.g. writing check attributes), the geometry is unchanged.
+        _held.difference_update(held)
+        names = set(names) - held
+
+    for key in [key for key in _entries if key[1] in names or key[2] in names]:
+        _size -= _entries.pop(key)[1]
+
+
+def clear():
+    global _size
+
+    _entries.clear()
+    _held.clear()
+    _size = 0
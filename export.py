@@ -5,6 +5,8 @@
 
 import bpy
 
+import numpy as np
+
 from bpy.app.translations import (
     pgettext_tip as tip_,
     pgettext_data as data_,
@@ -55,6 +57,93 @@ def image_copy_guess(filepath, objects):
                 traceback.print_exc()
 
 
+# Binary STL record: normal, 3 vertices, attribute byte count (unused).
+STL_RECORD_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("verts", "<f4", (3, 3)),
+    ("attribute", "<u2"),
+])
+assert STL_RECORD_DTYPE.itemsize == 50
+
+
+def stl_header(num_triangles):
+    """80 byte header (same text as the bundled exporter) and triangle count."""
+    text = ("Exported from Blender-" + bpy.app.version_string).encode("ascii")
+    return text[:80].ljust(80, b"\0") + np.uint32(num_triangles).astype("<u4").tobytes()
+
+
+def stl_records(tri_co):
+    """Fill STL records from (n, 3, 3) triangle coordinates, normals from the winding."""
+    records = np.zeros(len(tri_co), dtype=STL_RECORD_DTYPE)
+    records["verts"] = tri_co
+    normals = np.cross(tri_co[:, 1] - tri_co[:, 0], tri_co[:, 2] - tri_co[:, 0])
+    lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+    # Degenerate triangles get a zero normal.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        records["normal"] = np.where(
+            (lengths > 0.0)[:, np.newaxis], normals / lengths[:, np.newaxis], 0.0)
+    return records
+
+
+def _triangles_evaluated(obj, depsgraph, matrix):
+    """(n, 3, 3) transformed triangle coordinates of the evaluated object, None when it has no mesh."""
+    obj_eval = obj.evaluated_get(depsgraph)
+    try:
+        me = obj_eval.to_mesh()
+    except RuntimeError:
+        return None
+    if me is None:
+        return None
+    try:
+        me.calc_loop_triangles()
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        tri_verts = np.empty(len(me.loop_triangles) * 3, dtype=np.int32)
+        me.loop_triangles.foreach_get("vertices", tri_verts)
+    finally:
+        obj_eval.to_mesh_clear()
+
+    co = co.reshape(-1, 3).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    tri_verts = tri_verts.reshape(-1, 3)
+    if np.linalg.det(matrix[:3, :3]) < 0.0:
+        # Mirrored, keep the normals pointing out.
+        tri_verts = tri_verts[:, (0, 2, 1)]
+    return co[tri_verts]
+
+
+def write_stl(filepath, objects, depsgraph, global_scale=1.0):
+    """
+    Write the evaluated (modifiers applied) objects to one binary STL file,
+    in world space scaled by ``global_scale``.
+    """
+    scale = np.diag((global_scale, global_scale, global_scale, 1.0))
+
+    # Edit-mode changes only reach the evaluated mesh when flushed.
+    flushed = [obj for obj in objects if obj.mode == 'EDIT']
+    for obj in flushed:
+        obj.update_from_editmode()
+    if flushed:
+        depsgraph.update()
+
+    tri_co = []
+    for obj in objects:
+        co = _triangles_evaluated(
+            obj, depsgraph, scale @ np.array(obj.matrix_world, dtype=np.float64))
+        if co is not None and len(co):
+            tri_co.append(co)
+    tri_co = np.concatenate(tri_co) if tri_co else np.zeros((0, 3, 3))
+
+    records = stl_records(tri_co)
+    try:
+        with open(filepath, "wb") as fh:
+            fh.write(stl_header(len(records)))
+            records.tofile(fh)
+    except OSError as ex:
+        print(f"STL export failed: {ex}")
+        return {'CANCELLED'}
+    return {'FINISHED'}
+
+
 def write_mesh(context, report_cb):
     import os
 
@@ -104,13 +193,11 @@ def write_mesh(context, report_cb):
             addon_utils.enable(addon_id, default_set=False)
 
     if export_format == 'STL':
-        addon_ensure("io_mesh_stl")
         filepath = bpy.path.ensure_ext(filepath, ".stl")
-        ret = bpy.ops.export_mesh.stl(
-            filepath=filepath,
-            ascii=False,
-            use_mesh_modifiers=True,
-            use_selection=True,
+        ret = write_stl(
+            filepath,
+            context.selected_objects,
+            context.evaluated_depsgraph_get(),
             global_scale=global_scale,
         )
     elif export_format == 'PLY':
@@ -0,0 +1,334 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Batch QA from the command line, without the UI:
+#
+#   blender -b --factory-startup --python headless.py -- INPUT_DIR OUTPUT_DIR [--jobs N]
+#
+# Every STL/OBJ/PLY file under INPUT_DIR is imported into an empty scene and
+# all checks of MESH_OT_stk_tools_check_all are run on its meshes. One JSON
+# report per file is written to OUTPUT_DIR (mirroring INPUT_DIR) and all of
+# them are collected in OUTPUT_DIR/report.csv at the end.
+#
+# Files that already have a JSON report are skipped, so an interrupted run
+# can simply be started again. A file that crashed Blender is reported as
+# an error on the next run instead of being retried, unless --retry-crashed
+# is given. Stopping a run with Ctrl-C doesn't count as a crash.
+#
+# This script is not part of the add-on zip, run it from the source directory.
+
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+
+EXTENSIONS = (".stl", ".obj", ".ply")
+
+CHECK_NAMES = (
+    "solid",
+    "intersect",
+    "degenerate",
+    "distorted",
+    "thick",
+    "sharp",
+    "overhang",
+)
+
+CSV_FIELDS = (
+    "file",
+    "status",
+    "objects",
+    "issues",
+    *CHECK_NAMES,
+    "volume",
+    "area",
+    "seconds",
+    "error",
+)
+
+PACKAGE_NAME = "santouka_blender_helper"
+
+CRASHED_ERROR = "crashed in a previous run"
+
+
+def parse_args(argv):
+    # Blender passes everything after "--" on to the script.
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+
+    parser = argparse.ArgumentParser(
+        prog="blender -b --factory-startup --python headless.py --",
+        description="Run the 3D print checks on every STL/OBJ/PLY file of a directory",
+    )
+    parser.add_argument("input_dir", help="directory with the files to check")
+    parser.add_argument("output_dir", help="directory for the JSON reports and report.csv")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="number of Blender processes to run in parallel (default: 1)")
+    parser.add_argument(
+        "--no-recursive", dest="recursive", action="store_false",
+        help="do not look for files in sub-directories")
+    parser.add_argument(
+        "--retry-crashed", action="store_true",
+        help="check files again that crashed Blender or were interrupted in a previous run")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+
+def find_files(input_dir, recursive=True):
+    files = []
+    for root, dirs, names in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith(EXTENSIONS):
+                files.append(os.path.relpath(os.path.join(root, name), input_dir))
+        if not recursive:
+            break
+    return files
+
+
+def report_path(output_dir, rel_path):
+    return os.path.join(output_dir, rel_path + ".json")
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=1)
+    # Never leave a half written report behind, it would be skipped on resume.
+    os.replace(tmp, path)
+
+
+# -----------------------------------------------------------------------------
+# Checking (inside Blender)
+
+def load_package():
+    """Import and register the add-on from the directory of this script."""
+    import importlib.util
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    package = sys.modules.get(PACKAGE_NAME)
+    if package is None:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE_NAME,
+            os.path.join(directory, "__init__.py"),
+            submodule_search_locations=[directory],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE_NAME] = package
+        spec.loader.exec_module(package)
+        package.register()
+    return package
+
+
+def _operator(names):
+    import bpy
+
+    for name in names:
+        submodule, op = name.split(".")
+        # bpy.ops returns a wrapper for any attribute, list the real ones.
+        if op in dir(getattr(bpy.ops, submodule)):
+            return getattr(getattr(bpy.ops, submodule), op)
+    raise RuntimeError("no importer found, tried: " + ", ".join(names))
+
+
+def import_file(filepath):
+    """Import a file into the current scene, returns its mesh objects."""
+    import bpy
+
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".stl":
+        op = _operator(("wm.stl_import", "import_mesh.stl"))
+    elif ext == ".obj":
+        op = _operator(("wm.obj_import", "import_scene.obj"))
+    else:
+        op = _operator(("wm.ply_import", "import_mesh.ply"))
+
+    existing = set(bpy.data.objects)
+    op(filepath=filepath)
+    return [
+        obj for obj in bpy.data.objects
+        if obj not in existing and obj.type == 'MESH'
+    ]
+
+
+def clear_scene(package):
+    import bpy
+
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    package.cache.clear()
+    package.report.clear()
+
+
+def check_file(package, filepath):
+    import bpy
+
+    operators = package.operators
+    mesh_helpers = package.mesh_helpers
+    check_cls = operators.MESH_OT_stk_tools_check_all.check_cls
+    stk_tools_props = bpy.context.scene.stk_tools_props
+
+    objects = []
+    for obj in import_file(filepath):
+        checks = {}
+        for cls, cls_info in zip(
+                check_cls, operators.iter_checks(obj, check_cls, stk_tools_props)):
+            checks[cls.check_name] = [
+                {
+                    "text": text,
+                    "type": data[0] if data else None,
+                    "count": len(data[1]) if data else 0,
+                }
+                for text, data in cls_info
+            ]
+
+        mass = mesh_helpers.mesh_mass_properties(obj)
+        objects.append({
+            "name": obj.name,
+            "verts": len(obj.data.vertices),
+            "faces": len(obj.data.polygons),
+            "volume": abs(mass.volume),
+            "area": mass.area,
+            "checks": checks,
+        })
+
+    return objects
+
+
+def is_crashed(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)["error"] == CRASHED_ERROR
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def process_files(input_dir, output_dir, files, retry_crashed=False):
+    package = load_package()
+
+    for num, rel_path in enumerate(files, 1):
+        path = report_path(output_dir, rel_path)
+        if os.path.exists(path) and not (retry_crashed and is_crashed(path)):
+            continue
+
+        print(f"[{num}/{len(files)}] {rel_path}", flush=True)
+        marker = path + ".running"
+        data = {"file": rel_path, "status": "ok", "objects": [], "error": ""}
+
+        if os.path.exists(marker) and not retry_crashed:
+            # Blender died on this file last time.
+            data["status"] = "error"
+            data["error"] = CRASHED_ERROR
+            write_json(path, data)
+            os.remove(marker)
+            continue
+
+        os.makedirs(os.path.dirname(marker), exist_ok=True)
+        open(marker, "w").close()
+
+        t = time.perf_counter()
+        try:
+            data["objects"] = check_file(package, os.path.join(input_dir, rel_path))
+            if not data["objects"]:
+                data["status"] = "error"
+                data["error"] = "no mesh imported"
+        except KeyboardInterrupt:
+            # Stopped by the user, not a crash.
+            os.remove(marker)
+            raise
+        except Exception as ex:
+            data["status"] = "error"
+            data["error"] = f"{type(ex).__name__}: {ex}"
+        data["seconds"] = round(time.perf_counter() - t, 3)
+
+        clear_scene(package)
+        write_json(path, data)
+        os.remove(marker)
+
+
+# -----------------------------------------------------------------------------
+# Running and collecting
+
+def run_workers(args, jobs):
+    import bpy
+
+    procs = [
+        subprocess.Popen([
+            bpy.app.binary_path, "-b", "--factory-startup",
+            "--python", os.path.abspath(__file__), "--",
+            args.input_dir, args.output_dir,
+            *(() if args.recursive else ("--no-recursive",)),
+            *(("--retry-crashed",) if args.retry_crashed else ()),
+            "--worker", f"{i}/{jobs}",
+        ])
+        for i in range(jobs)
+    ]
+    return [proc.wait() for proc in procs]
+
+
+def csv_row(data):
+    row = dict.fromkeys(CSV_FIELDS, "")
+    row.update(file=data["file"], status=data["status"], error=data["error"])
+    row["seconds"] = data.get("seconds", "")
+    row["objects"] = len(data["objects"])
+
+    for name in CHECK_NAMES:
+        row[name] = sum(
+            entry["count"]
+            for obj in data["objects"]
+            for entry in obj["checks"].get(name, ())
+        )
+    row["issues"] = sum(row[name] for name in CHECK_NAMES)
+    row["volume"] = sum(obj["volume"] for obj in data["objects"])
+    row["area"] = sum(obj["area"] for obj in data["objects"])
+    return row
+
+
+def write_csv(output_dir, files):
+    path = os.path.join(output_dir, "report.csv")
+    missing = 0
+    with open(path + ".tmp", "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for rel_path in files:
+            try:
+                with open(report_path(output_dir, rel_path), encoding="utf-8") as fj:
+                    data = json.load(fj)
+            except FileNotFoundError:
+                missing += 1
+                continue
+            writer.writerow(csv_row(data))
+    os.replace(path + ".tmp", path)
+    return path, missing
+
+
+def main():
+    args = parse_args(sys.argv)
+    files = find_files(args.input_dir, args.recursive)
+
+    if args.worker:
+        index, jobs = map(int, args.worker.split("/"))
+        process_files(args.input_dir, args.output_dir, files[index::jobs], args.retry_crashed)
+        return
+
+    jobs = max(1, min(args.jobs, len(files)))
+    if jobs > 1:
+        run_workers(args, jobs)
+    else:
+        process_files(args.input_dir, args.output_dir, files, args.retry_crashed)
+
+    path, missing = write_csv(args.output_dir, files)
+    print(f"{len(files) - missing}/{len(files)} files checked, see {path}")
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Bottom mesh for vacuum forming, built from a top-down heightmap.
+#
+# Rays are cast straight down on a regular grid against a BVH tree of the
+# target, the surface they hit is given a thickness along its normals and
+# closed with side walls. No operators or temporary objects are involved.
+#
+# Results of each stage are kept keyed by their inputs, so trying another
+# thickness from the redo panel doesn't cast the rays again.
+
+
+from collections import OrderedDict
+
+import numpy as np
+
+# Refuse grids larger than this many rays.
+NODES_MAX = 16 * 1024 * 1024
+
+# Results kept per stage.
+STAGE_ENTRIES_MAX = 4
+
+# stage name -> OrderedDict(key -> result), least recently used first
+_stages = {}
+
+
+def stage_get(stage, key):
+    """Return the cached result of a stage or None."""
+    entries = _stages.get(stage)
+    if entries is None or key not in entries:
+        return None
+    entries.move_to_end(key)
+    return entries[key]
+
+
+def stage_put(stage, key, value):
+    entries = _stages.setdefault(stage, OrderedDict())
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > STAGE_ENTRIES_MAX:
+        entries.popitem(last=False)
+    return value
+
+
+def stage_clear():
+    _stages.clear()
+
+
+def heightmap(co, tri_verts, x_min, y_min, nx, ny, cell_size, z_start):
+    """
+    Cast a grid of rays down from ``z_start``.
+
+    Returns the (nx,) x and (ny,) y node coordinates and a (ny, nx) array
+    of the heights hit, NaN where a ray missed.
+    """
+    from mathutils.bvhtree import BVHTree
+
+    xs = x_min + np.arange(nx) * cell_size
+    ys = y_min + np.arange(ny) * cell_size
+
+    tree = BVHTree.FromPolygons(co.tolist(), tri_verts.tolist(), all_triangles=True)
+    ray_cast = tree.ray_cast
+    direction = (0.0, 0.0, -1.0)
+
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    z = np.fromiter(
+        (
+            np.nan if hit is None else hit[2]
+            for hit, _no, _index, _dist in (
+                ray_cast((x, y, z_start), direction)
+                for x, y in zip(grid_x.ravel().tolist(), grid_y.ravel().tolist())
+            )
+        ),
+        dtype=np.float64,
+        count=nx * ny,
+    )
+    return xs, ys, z.reshape(ny, nx)
+
+
+def shell(xs, ys, z, thickness):
+    """
+    Build a closed shell ``thickness`` thick, centered on the heightmap surface.
+
+    Only grid cells with all four corners hit are used. The top and bottom
+    sides are offset by half the thickness along the area weighted normals
+    of the surface, the side walls follow its boundary.
+
+    Returns (co, faces) arrays, (n, 3) floats and (m, 4) vertex indices.
+    """
+    ny, nx = z.shape
+    is_hit = ~np.isnan(z)
+
+    # Cells by their lower left node, corners counter-clockwise seen from above.
+    node = np.arange(nx * ny).reshape(ny, nx)
+    cell_nodes = np.stack((
+        node[:-1, :-1], node[:-1, 1:], node[1:, 1:], node[1:, :-1],
+    ), axis=-1).reshape(-1, 4)
+    cell_nodes = cell_nodes[is_hit.ravel()[cell_nodes].all(axis=1)]
+    if not len(cell_nodes):
+        return np.zeros((0, 3)), np.zeros((0, 4), dtype=np.int32)
+
+    # Compact the nodes in use.
+    used, faces = np.unique(cell_nodes, return_inverse=True)
+    faces = faces.reshape(-1, 4).astype(np.int32)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    co = np.stack((grid_x.ravel()[used], grid_y.ravel()[used], z.ravel()[used]), axis=1)
+
+    # Quad normals from the diagonals (twice the area), summed per vertex.
+    face_no = np.cross(co[faces[:, 2]] - co[faces[:, 0]], co[faces[:, 3]] - co[faces[:, 1]])
+    vert_no = np.zeros_like(co)
+    for i in range(4):
+        np.add.at(vert_no, faces[:, i], face_no)
+    vert_no /= np.sqrt(np.einsum("ij,ij->i", vert_no, vert_no))[:, np.newaxis]
+
+    offset = vert_no * (thickness / 2.0)
+    vert_len = len(co)
+    co = np.concatenate((co + offset, co - offset))
+
+    # Boundary edges are used by one cell only, kept in the direction of that cell.
+    edges = np.stack((faces, np.roll(faces, -1, axis=1)), axis=-1).reshape(-1, 2)
+    edge_keys = np.sort(edges, axis=1) @ np.array([vert_len, 1])
+    _keys, key_index, key_count = np.unique(
+        edge_keys, return_inverse=True, return_counts=True)
+    boundary = edges[key_count[key_index] == 1]
+
+    faces = np.concatenate((
+        faces,
+        faces[:, ::-1] + vert_len,
+        np.stack((
+            boundary[:, 0], boundary[:, 0] + vert_len,
+            boundary[:, 1] + vert_len, boundary[:, 1],
+        ), axis=1),
+    ))
+    return co, faces
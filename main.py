@@ -3,6 +3,7 @@
 from bpy.props import (
     StringProperty,
     BoolProperty,
+    IntProperty,
     FloatProperty,
     EnumProperty,
     PointerProperty,
@@ -14,19 +15,28 @@ import math
 from . import (
     ui,
     operators,
+    suggestion,
 )
 
 from bpy.app.handlers import persistent
 
 
 @persistent
-def remesh_suggestion(dummy):
-    selected_objects = bpy.context.selected_objects
-    if selected_objects:
-        # give suggestion about remesh size here
-        print(f"Selected object: {selected_objects[-1].name}")
-    else:
-        print("没有选择物体")
+def invalidate_caches(scene, depsgraph):
+    from . import bounds, cache
+
+    geometry = set()
+    transform = set()
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            geometry.add(update.id.original.name)
+        elif update.is_updated_transform:
+            transform.add(update.id.original.name)
+
+    if geometry:
+        cache.invalidate(geometry)
+    if geometry or transform:
+        bounds.invalidate(geometry | transform)
 
 
 class SceneProperties(PropertyGroup):
@@ -36,11 +46,40 @@ class SceneProperties(PropertyGroup):
     """
 
     thinning_float: bpy.props.FloatProperty(name="减薄/增厚量", default=-0.5)
+    thinning_even_offset: bpy.props.BoolProperty(
+        name="均匀厚度",
+        description="Scale the offset so faces, not only vertices, move by the full amount",
+        default=False)
 
     bottom_thinning_float: bpy.props.FloatProperty(
         name="壁厚(mm)", default=1.5)
     bottom_remesh_float: bpy.props.FloatProperty(
         name="结构最小单元", default=0.3)
+    bottom_final_remesh: bpy.props.BoolProperty(
+        name="最终重构网格",
+        description="Voxel remesh the bottom mesh once it is built, fixes overlaps on steep parts but is slow",
+        default=False)
+    remesh_budget_mode: EnumProperty(
+        name="超出预算时",
+        description="What to do when a voxel remesh is predicted to exceed the budget or open holes in thin walls",
+        items=(
+            ('REFUSE', "拒绝", "Skip the remesh"),
+            ('ADJUST', "自动调整", "Pick a voxel size within the budget that keeps thin walls closed"),
+        ),
+        default='REFUSE',
+    )
+    remesh_memory_budget: FloatProperty(
+        name="内存上限(MB)",
+        description="Largest predicted memory use of a voxel remesh",
+        default=4096.0,
+        min=64.0,
+    )
+    remesh_faces_budget: IntProperty(
+        name="面数上限",
+        description="Largest predicted face count of a voxel remesh",
+        default=5000000,
+        min=1000,
+    )
 
     """
     Properties 3D print helper tools. 
@@ -125,6 +164,27 @@ class SceneProperties(PropertyGroup):
         min=0.0,
         max=math.radians(90.0),
     )
+    use_check_attributes: BoolProperty(
+        name="保存为网格属性",
+        description="Write the check results as stk_* attributes on the mesh, so they are saved with the file",
+        default=False,
+    )
+    batch_sort: EnumProperty(
+        name="排序",
+        description="Sort the batch check summary by",
+        items=(
+            ('ISSUES', "问题数", ""),
+            ('NAME', "名称", ""),
+            ('VOLUME', "体积", ""),
+            ('AREA', "面积", ""),
+        ),
+        default='ISSUES',
+    )
+    batch_sort_reverse: BoolProperty(
+        name="倒序",
+        description="Sort the batch check summary in descending order",
+        default=True,
+    )
 
 
 classes = (
@@ -147,6 +207,7 @@ classes = (
     operators.MESH_OT_stk_tools_check_sharp,
     operators.MESH_OT_stk_tools_check_overhang,
     operators.MESH_OT_stk_tools_check_all,
+    operators.MESH_OT_stk_tools_check_batch,
     operators.MESH_OT_stk_tools_clean_distorted,
     # operators.MESH_OT_stk_tools_clean_thin,
     operators.MESH_OT_stk_tools_clean_non_manifold,
@@ -170,11 +231,14 @@ def addon_register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.stk_tools_props = PointerProperty(type=SceneProperties)
-    bpy.app.handlers.depsgraph_update_post.append(remesh_suggestion)
+    bpy.app.handlers.depsgraph_update_post.append(suggestion.remesh_suggestion)
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_caches)
 
 
 def addon_unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.stk_tools_props
-    bpy.app.handlers.depsgraph_update_post.remove(remesh_suggestion)
+    bpy.app.handlers.depsgraph_update_post.remove(suggestion.remesh_suggestion)
+    suggestion.unregister()
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_caches)
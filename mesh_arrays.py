@@ -0,0 +1,749 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Array based mesh analysis.
+#
+# Everything in this module works on plain NumPy arrays
+# (see mesh_helpers.mesh_arrays_from_object) and must not import
+# bpy, bmesh or mathutils.
+
+
+import numpy as np
+
+
+class MeshArrays:
+    """Flat copies of the mesh data needed by the array based checks."""
+
+    __slots__ = (
+        "co",
+        "edge_verts",
+        "loop_verts",
+        "loop_edges",
+        "poly_loop_start",
+        "poly_loop_total",
+        "tri_verts",
+        "tri_polys",
+    )
+
+    def __init__(self, co, edge_verts, loop_verts, loop_edges,
+                 poly_loop_start, poly_loop_total, tri_verts, tri_polys):
+        # (n, 3) float64
+        self.co = co
+        # (n, 2) int32
+        self.edge_verts = edge_verts
+        # (n,) int32
+        self.loop_verts = loop_verts
+        self.loop_edges = loop_edges
+        self.poly_loop_start = poly_loop_start
+        self.poly_loop_total = poly_loop_total
+        # (n, 3) int32, loop triangles and the polygon each one belongs to.
+        self.tri_verts = tri_verts
+        self.tri_polys = tri_polys
+
+
+def index_array(mask):
+    """Convert a boolean mask to the read-only int array of indices the report uses."""
+    ret = np.flatnonzero(mask).astype(np.intc)
+    ret.flags.writeable = False
+    return ret
+
+
+def loop_polys(loop_start, loop_total):
+    """Polygon index of every loop."""
+    return np.repeat(np.arange(len(loop_start), dtype=np.int32), loop_total)
+
+
+def loop_next(loop_start, loop_total):
+    """Index of the next loop in the same polygon, for every loop."""
+    ret = np.arange(1, int(loop_total.sum()) + 1, dtype=np.int32)
+    ret[loop_start + loop_total - 1] = loop_start
+    return ret
+
+
+def loop_prev(loop_start, loop_total):
+    """Index of the previous loop in the same polygon, for every loop."""
+    ret = np.arange(-1, int(loop_total.sum()) - 1, dtype=np.int32)
+    ret[loop_start] = loop_start + loop_total - 1
+    return ret
+
+
+def polygon_normals(co, loop_verts, loop_start, loop_total):
+    """Un-normalized (Newell) polygon normals, their length is twice the area."""
+    if not len(loop_start):
+        return np.zeros((0, 3))
+
+    loop_poly = loop_polys(loop_start, loop_total)
+    # Relative to the first vertex of each polygon to keep precision.
+    co_base = co[loop_verts[loop_start]][loop_poly]
+    co_a = co[loop_verts] - co_base
+    co_b = co[loop_verts[loop_next(loop_start, loop_total)]] - co_base
+
+    return np.add.reduceat(np.cross(co_a, co_b), loop_start, axis=0)
+
+
+def normalized(vecs):
+    """Return (unit vectors, lengths), zero length vectors stay zero."""
+    lengths = np.sqrt(np.einsum("ij,ij->i", vecs, vecs))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unit = vecs / lengths[:, None]
+    unit[lengths == 0.0] = 0.0
+    return unit, lengths
+
+
+def polygon_areas(co, loop_verts, loop_start, loop_total):
+    normals = polygon_normals(co, loop_verts, loop_start, loop_total)
+    return np.sqrt(np.einsum("ij,ij->i", normals, normals)) * 0.5
+
+
+def shell_offsets(co, loop_verts, loop_start, loop_total, use_even_offset=False, factor_max=4.0):
+    """
+    Per vertex direction to offset the surface by a distance of 1.0.
+
+    Area weighted vertex normals, with ``use_even_offset`` they are lengthened
+    so the faces around each vertex move by the distance (not only the vertex),
+    limited to ``factor_max``. Vertices without faces don't move.
+    """
+    poly_no = polygon_normals(co, loop_verts, loop_start, loop_total)
+    loop_no = np.repeat(poly_no, loop_total, axis=0)
+    vert_no = np.zeros_like(co, dtype=np.float64)
+    np.add.at(vert_no, loop_verts, loop_no)
+    vert_no, _lengths = normalized(vert_no)
+
+    if use_even_offset:
+        # Area weighted 1 / cos of the angles between the vertex and face normals.
+        area = np.zeros(len(co))
+        np.add.at(area, loop_verts, np.sqrt(np.einsum("ij,ij->i", loop_no, loop_no)))
+        projected = np.zeros(len(co))
+        np.add.at(projected, loop_verts, np.einsum("ij,ij->i", loop_no, vert_no[loop_verts]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = np.clip(area / projected, 1.0, factor_max)
+        factor[~(projected > 0.0)] = 1.0
+        vert_no *= factor[:, None]
+
+    return vert_no
+
+
+def edge_lengths(co, edge_verts):
+    vecs = co[edge_verts[:, 1]] - co[edge_verts[:, 0]]
+    return np.sqrt(np.einsum("ij,ij->i", vecs, vecs))
+
+
+def angle_normalized(unit_a, unit_b):
+    """Angle between unit vectors, stable for small and large angles."""
+    dot = np.einsum("ij,ij->i", unit_a, unit_b)
+    diff = np.where((dot >= 0.0)[:, None], unit_a - unit_b, unit_a + unit_b)
+    half = np.arcsin(np.clip(np.sqrt(np.einsum("ij,ij->i", diff, diff)) * 0.5, 0.0, 1.0))
+    return np.where(dot >= 0.0, 2.0 * half, np.pi - 2.0 * half)
+
+
+def connected_components(node_len, links_a, links_b):
+    """Root node of every node, for the graph given by the link pairs."""
+    parent = np.arange(node_len)
+    while True:
+        root_a = parent[links_a]
+        root_b = parent[links_b]
+        todo = root_a != root_b
+        if not todo.any():
+            return parent
+        # Hook the larger root onto the smaller one, then compress paths.
+        np.minimum.at(
+            parent, np.maximum(root_a[todo], root_b[todo]), np.minimum(root_a[todo], root_b[todo]))
+        while True:
+            parent_next = parent[parent]
+            if (parent_next == parent).all():
+                break
+            parent = parent_next
+
+
+class TopologyIndex:
+    """
+    Edge to face adjacency in compressed (CSR) form, built once from loop arrays.
+
+    edge_verts: (n, 2) vertices of every edge.
+    face_counts: number of faces using each edge.
+    offsets: (n + 1,) range of each edge in ``loops``/``faces``.
+    loops, faces: loops using each edge in loop order, and their polygons.
+    contiguous: manifold edges whose two faces use the edge in opposite directions.
+    """
+
+    __slots__ = (
+        "edge_verts",
+        "face_counts",
+        "offsets",
+        "loops",
+        "faces",
+        "contiguous",
+        "_arrays",
+    )
+
+    def __init__(self, arrays):
+        edge_len = len(arrays.edge_verts)
+        loop_edges = arrays.loop_edges
+
+        self._arrays = arrays
+        self.edge_verts = arrays.edge_verts
+        self.face_counts = np.bincount(loop_edges, minlength=edge_len)
+        self.offsets = np.zeros(edge_len + 1, dtype=np.int64)
+        np.cumsum(self.face_counts, out=self.offsets[1:])
+        self.loops = np.argsort(loop_edges, kind="stable").astype(np.int32)
+        self.faces = loop_polys(arrays.poly_loop_start, arrays.poly_loop_total)[self.loops]
+
+        edges, loops_a, loops_b = self.manifold_loop_pairs()
+        self.contiguous = np.zeros(edge_len, dtype=bool)
+        self.contiguous[edges] = arrays.loop_verts[loops_a] != arrays.loop_verts[loops_b]
+
+    @property
+    def manifold(self):
+        return self.face_counts == 2
+
+    def edges_non_manifold(self):
+        return self.face_counts != 2
+
+    def edges_non_contiguous(self):
+        return self.manifold & ~self.contiguous
+
+    def manifold_loop_pairs(self):
+        """
+        Loops of manifold edges, returns (edge indices, first loops, second loops).
+
+        Loops are in loop order, so the second one belongs to the face
+        added last, the one a bmesh radial cycle starts with.
+        """
+        edges = np.flatnonzero(self.face_counts == 2)
+        start = self.offsets[edges]
+        return edges, self.loops[start], self.loops[start + 1]
+
+    def verts_non_manifold(self, use_wire=True, use_boundary=True, use_verts=True):
+        """
+        Vertex mask matching the edit-mode "Select Non Manifold" options.
+
+        With ``use_verts``, loose vertices, vertices of wire or multi-face edges,
+        vertices on more than two boundary edges and vertices joining
+        several face fans are included.
+        """
+        arrays = self._arrays
+        vert_len = len(arrays.co)
+        edge_verts = self.edge_verts
+        face_counts = self.face_counts
+
+        verts = np.zeros(vert_len, dtype=bool)
+        if use_wire:
+            verts[edge_verts[face_counts == 0].ravel()] = True
+        if use_boundary:
+            verts[edge_verts[face_counts == 1].ravel()] = True
+        if not use_verts:
+            return verts
+
+        verts[np.bincount(edge_verts.ravel(), minlength=vert_len) == 0] = True
+        verts[edge_verts[(face_counts == 0) | (face_counts > 2)].ravel()] = True
+        boundary_len = np.bincount(edge_verts[face_counts == 1].ravel(), minlength=vert_len)
+        verts[boundary_len > 2] = True
+
+        # Corners (loops) around a vertex joined by manifold edges form fans,
+        # a manifold vertex has exactly one.
+        loop_verts = arrays.loop_verts
+        loop_next_index = loop_next(arrays.poly_loop_start, arrays.poly_loop_total)
+        edges, loops_a, loops_b = self.manifold_loop_pairs()
+        vert_0 = edge_verts[edges, 0]
+
+        def corners(loops):
+            loops_other = loop_next_index[loops]
+            at_0 = loop_verts[loops] == vert_0
+            return np.where(at_0, loops, loops_other), np.where(at_0, loops_other, loops)
+
+        a_0, a_1 = corners(loops_a)
+        b_0, b_1 = corners(loops_b)
+        roots = connected_components(
+            len(loop_verts), np.concatenate((a_0, a_1)), np.concatenate((b_0, b_1)))
+        is_root = roots == np.arange(len(roots))
+        verts[np.bincount(loop_verts[is_root], minlength=vert_len) > 1] = True
+        return verts
+
+
+def check_overhang(co, arrays, angle_overhang):
+    """Faces pointing down within ``angle_overhang`` of -Z, zero area faces are ignored."""
+    normals, lengths = normalized(polygon_normals(
+        co, arrays.loop_verts, arrays.poly_loop_start, arrays.poly_loop_total))
+    angles = np.arccos(np.clip(-normals[:, 2], -1.0, 1.0))
+    return index_array((lengths != 0.0) & (angles < angle_overhang))
+
+
+def check_sharp(co, arrays, topology, angle_sharp):
+    """Manifold edges with a signed face angle above ``angle_sharp`` (negative when concave)."""
+    loop_start = arrays.poly_loop_start
+    loop_total = arrays.poly_loop_total
+    loop_verts = arrays.loop_verts
+
+    normals, _ = normalized(polygon_normals(co, loop_verts, loop_start, loop_total))
+    edges, loops_b, loops_a = topology.manifold_loop_pairs()
+    loop_poly = loop_polys(loop_start, loop_total)
+    # The most recently added loop comes first, as in a bmesh radial cycle.
+    no_a = normals[loop_poly[loops_a]]
+    no_b = normals[loop_poly[loops_b]]
+
+    angles = angle_normalized(no_a, no_b)
+    edge_dir = co[loop_verts[loop_next(loop_start, loop_total)[loops_a]]] - co[loop_verts[loops_a]]
+    convex = (
+        (no_a == no_b).all(axis=1) |
+        (np.einsum("ij,ij->i", edge_dir, np.cross(no_a, no_b)) > 0.0)
+    )
+    angles[~convex] *= -1.0
+
+    edges_sharp = np.zeros(len(arrays.edge_verts), dtype=bool)
+    edges_sharp[edges[angles > angle_sharp]] = True
+    return index_array(edges_sharp)
+
+
+def check_distorted(co, arrays, angle_distort):
+    """Faces where a corner normal deviates more than ``angle_distort`` from the face normal."""
+    loop_start = arrays.poly_loop_start
+    loop_total = arrays.poly_loop_total
+    loop_verts = arrays.loop_verts
+
+    if not len(loop_start):
+        return index_array(np.zeros(0, dtype=bool))
+
+    face_no, face_len = normalized(polygon_normals(co, loop_verts, loop_start, loop_total))
+    loop_face_no = face_no[loop_polys(loop_start, loop_total)]
+
+    co_loop = co[loop_verts]
+    vec_prev = co[loop_verts[loop_prev(loop_start, loop_total)]] - co_loop
+    vec_next = co[loop_verts[loop_next(loop_start, loop_total)]] - co_loop
+
+    # Co-linear corners use the face normal.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        axis = np.argmax(vec_next != 0.0, axis=1)
+        rows = np.arange(len(axis))
+        denom = vec_next[rows, axis]
+        fac = np.where(denom != 0.0, vec_prev[rows, axis] / denom, 0.0)
+    off_line = vec_next * fac[:, None] - vec_prev
+    corner_ok = (
+        (fac != 0.0) &
+        vec_prev.any(axis=1) &
+        (np.einsum("ij,ij->i", off_line, off_line) > 1e-5)
+    )
+    loop_no, _ = normalized(np.cross(vec_prev, vec_next))
+    loop_no[~corner_ok] = loop_face_no[~corner_ok]
+
+    cos_angle = np.abs(np.einsum("ij,ij->i", loop_no, loop_face_no))
+    loop_bad = np.arccos(np.clip(cos_angle, 0.0, 1.0)) > angle_distort
+    # Zero length normals always count as distorted.
+    loop_bad |= ~loop_no.any(axis=1)
+
+    faces_distort = np.logical_or.reduceat(loop_bad, loop_start)
+    faces_distort |= face_len == 0.0
+    return index_array(faces_distort)
+
+
+def check_solid(topology):
+    """Return (non-manifold, non-contiguous) edge index arrays."""
+    return (
+        index_array(topology.edges_non_manifold()),
+        index_array(topology.edges_non_contiguous()),
+    )
+
+
+class MassProperties:
+    """Volume, surface area, centroid and inertia tensor (unit density) of a mesh."""
+
+    __slots__ = (
+        "volume",
+        "area",
+        "centroid",
+        "inertia",
+    )
+
+    def __init__(self, volume, area, centroid, inertia):
+        # Signed, negative for inside-out meshes.
+        self.volume = volume
+        self.area = area
+        # (3,) float64
+        self.centroid = centroid
+        # (3, 3) float64, about the centroid.
+        self.inertia = inertia
+
+
+def mass_properties(co, tri_verts):
+    """Compute MassProperties from triangles in one float64 pass (signed tetrahedra to the origin)."""
+    v0 = co[tri_verts[:, 0]]
+    v1 = co[tri_verts[:, 1]]
+    v2 = co[tri_verts[:, 2]]
+
+    cross = np.cross(v1 - v0, v2 - v0)
+    area_x2 = np.sqrt(np.einsum("ij,ij->i", cross, cross))
+    area = float(area_x2.sum()) * 0.5
+    # Six times the signed volume of each tetrahedron (origin, v0, v1, v2).
+    det = np.einsum("ij,ij->i", v0, np.cross(v1, v2))
+    volume = float(det.sum()) / 6.0
+    tri_sum = v0 + v1 + v2
+
+    if volume != 0.0:
+        centroid = (det @ tri_sum) / (det.sum() * 4.0)
+    elif area != 0.0:
+        # Flat or open geometry, fall back to the surface centroid.
+        centroid = (area_x2 @ tri_sum) / (area_x2.sum() * 3.0)
+    else:
+        centroid = np.zeros(3)
+
+    # Second moments about the origin, summed over the canonical tetrahedron.
+    covariance = (
+        np.einsum("i,ij,ik->jk", det, v0, v0) +
+        np.einsum("i,ij,ik->jk", det, v1, v1) +
+        np.einsum("i,ij,ik->jk", det, v2, v2) +
+        np.einsum("i,ij,ik->jk", det, tri_sum, tri_sum)
+    ) / 120.0
+    covariance -= volume * np.outer(centroid, centroid)
+    inertia = np.trace(covariance) * np.eye(3) - covariance
+
+    return MassProperties(volume, area, centroid, inertia)
+
+
+def tri_points_random(co, tri_verts, num_points, rng, margin=0.05):
+    """
+    Random points on each triangle, (len(tri_verts) * num_points, 3).
+
+    Points of a triangle are consecutive, same sampling as the
+    original per-face generator but drawn in one batch from ``rng``.
+    """
+    uv = rng.uniform(0.0 + margin, 1.0 - margin,
+                     size=(len(tri_verts), num_points, 2))
+    flip = uv.sum(axis=2) > 1.0
+    uv[flip] = 1.0 - uv[flip]
+
+    co_0 = co[tri_verts[:, 0]][:, None, :]
+    side_1 = co[tri_verts[:, 1]][:, None, :] - co_0
+    side_2 = co[tri_verts[:, 2]][:, None, :] - co_0
+    points = co_0 + uv[:, :, 0, None] * side_1 + uv[:, :, 1, None] * side_2
+    return points.reshape(-1, 3)
+
+
+def check_degenerate(arrays, threshold):
+    """Return (faces, edges) index arrays with zero area/length."""
+    areas = polygon_areas(
+        arrays.co,
+        arrays.loop_verts,
+        arrays.poly_loop_start,
+        arrays.poly_loop_total,
+    )
+    lengths = edge_lengths(arrays.co, arrays.edge_verts)
+
+    return index_array(areas <= threshold), index_array(lengths <= threshold)
+
+
+def _tri_grid_entries(tri_min, tri_max, max_entries_factor=8):
+    """
+    Register every triangle in all cells of a uniform grid its bounds overlap.
+
+    Returns (cell size, grid origin, grid dims, sorted cell keys, sorted triangle indices).
+    """
+    extent = (tri_max - tri_min).max(axis=1)
+    origin = tri_min.min(axis=0)
+    cell = float(extent.mean()) * 2.0
+    if cell <= 0.0:
+        cell = max(float((tri_max.max(axis=0) - origin).max()), 1.0)
+
+    # Grow the cells until large triangles don't flood the grid.
+    while True:
+        cell_min = np.floor((tri_min - origin) / cell).astype(np.int64)
+        cell_max = np.floor((tri_max - origin) / cell).astype(np.int64)
+        spans = cell_max - cell_min + 1
+        counts = spans.prod(axis=1)
+        if counts.sum() <= len(tri_min) * max_entries_factor:
+            break
+        cell *= 2.0
+
+    dims = cell_max.max(axis=0) + 1
+    tri_index = np.repeat(np.arange(len(tri_min), dtype=np.int64), counts)
+    offset = np.arange(len(tri_index), dtype=np.int64) - \
+        np.repeat(np.cumsum(counts) - counts, counts)
+    spans = spans[tri_index]
+    cells = cell_min[tri_index]
+    cells[:, 0] += offset % spans[:, 0]
+    cells[:, 1] += (offset // spans[:, 0]) % spans[:, 1]
+    cells[:, 2] += offset // (spans[:, 0] * spans[:, 1])
+    del offset, spans
+
+    keys = cells[:, 0] + dims[0] * (cells[:, 1] + dims[1] * cells[:, 2])
+    order = np.argsort(keys, kind="stable")
+    return cell, origin, dims, keys[order], tri_index[order]
+
+
+def _segments_cross_tris(seg_a, seg_b, v0, v1, v2):
+    """Möller–Trumbore test of segments (seg_a, seg_b) against triangles, per row."""
+    return np.isfinite(_segments_tris_factor(seg_a, seg_b, v0, v1, v2))
+
+
+def _segments_tris_factor(seg_a, seg_b, v0, v1, v2):
+    """
+    Möller–Trumbore intersection of segments (seg_a, seg_b) with triangles, per row.
+
+    Returns the factor along each segment (0.0 at seg_a, 1.0 at seg_b), inf where it misses.
+    """
+    direction = seg_b - seg_a
+    edge_1 = v1 - v0
+    edge_2 = v2 - v0
+    h = np.cross(direction, edge_2)
+    det = np.einsum("ij,ij->i", edge_1, h)
+    # Parallel (and coplanar) segments are never reported.
+    valid = np.abs(det) > 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_det = 1.0 / det
+        s = seg_a - v0
+        u = inv_det * np.einsum("ij,ij->i", s, h)
+        q = np.cross(s, edge_1)
+        v = inv_det * np.einsum("ij,ij->i", direction, q)
+        t = inv_det * np.einsum("ij,ij->i", edge_2, q)
+        hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0) & (t <= 1.0)
+    return np.where(hit, t, np.inf)
+
+
+def segments_first_hit(seg_a, seg_b, co, tri_verts, tri_min, tri_max, grid):
+    """
+    Nearest triangle each segment crosses, -1 where it crosses none.
+
+    tri_min, tri_max: bounds of the triangles.
+    grid: _tri_grid_entries() of those bounds, segments only test the
+    triangles registered in the cells their bounds overlap.
+    """
+    cell, origin, dims, keys, tri_sorted = grid
+    hits = np.full(len(seg_a), -1, dtype=np.int64)
+
+    seg_min = np.minimum(seg_a, seg_b)
+    seg_max = np.maximum(seg_a, seg_b)
+    cell_min = np.floor((seg_min - origin) / cell).astype(np.int64)
+    cell_max = np.floor((seg_max - origin) / cell).astype(np.int64)
+    # Segments outside the grid can't hit anything.
+    inside = ((cell_max >= 0) & (cell_min < dims)).all(axis=1)
+    seg_index = np.flatnonzero(inside)
+    cell_min = np.clip(cell_min[inside], 0, dims - 1)
+    cell_max = np.clip(cell_max[inside], 0, dims - 1)
+
+    # (segment, cell) entries, as in _tri_grid_entries().
+    spans = cell_max - cell_min + 1
+    counts = spans.prod(axis=1)
+    entry_seg = np.repeat(np.arange(len(seg_index)), counts)
+    offset = np.arange(len(entry_seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+    spans = spans[entry_seg]
+    cells = cell_min[entry_seg]
+    cells[:, 0] += offset % spans[:, 0]
+    cells[:, 1] += (offset // spans[:, 0]) % spans[:, 1]
+    cells[:, 2] += offset // (spans[:, 0] * spans[:, 1])
+    entry_keys = cells[:, 0] + dims[0] * (cells[:, 1] + dims[1] * cells[:, 2])
+    del offset, spans, cells
+
+    # (segment, triangle) pairs from the triangles of each cell.
+    start = np.searchsorted(keys, entry_keys, side="left")
+    count = np.searchsorted(keys, entry_keys, side="right") - start
+    pair_seg = seg_index[np.repeat(entry_seg, count)]
+    pair_tri = tri_sorted[
+        np.repeat(start, count) + np.arange(int(count.sum())) -
+        np.repeat(np.cumsum(count) - count, count)]
+    if not len(pair_seg):
+        return hits
+
+    keep = (
+        (tri_min[pair_tri] <= seg_max[pair_seg]) &
+        (tri_max[pair_tri] >= seg_min[pair_seg])
+    ).all(axis=1)
+    pair_seg = pair_seg[keep]
+    pair_tri = pair_tri[keep]
+    tri_co = co[tri_verts[pair_tri]]
+
+    factor = _segments_tris_factor(
+        seg_a[pair_seg], seg_b[pair_seg], tri_co[:, 0], tri_co[:, 1], tri_co[:, 2])
+    is_hit = np.isfinite(factor)
+    pair_seg = pair_seg[is_hit]
+    pair_tri = pair_tri[is_hit]
+    factor = factor[is_hit]
+
+    # Nearest pair of each segment (pairs found in several cells don't matter).
+    order = np.lexsort((factor, pair_seg))
+    pair_seg = pair_seg[order]
+    first = np.ones(len(pair_seg), dtype=bool)
+    first[1:] = pair_seg[1:] != pair_seg[:-1]
+    hits[pair_seg[first]] = pair_tri[order][first]
+    return hits
+
+
+def check_thick(co, arrays, thickness, num_points=6, chunk_size=4096):
+    """
+    Faces thinner than ``thickness``, returns an array of face index values.
+
+    Same sampling as mesh_helpers.mesh_check_thick(), with the
+    rays tested as segments against a grid of the triangles instead of a
+    BVH tree, so it runs without mathutils (in the batch worker processes).
+    """
+    tri_verts = arrays.tri_verts
+    tri_polys = arrays.tri_polys
+    faces_error = np.zeros(len(arrays.poly_loop_start), dtype=bool)
+
+    EPS_BIAS = 0.0001
+    distance = thickness - EPS_BIAS
+    if not len(tri_verts) or distance <= 0.0:
+        return index_array(faces_error)
+
+    poly_no, _ = normalized(polygon_normals(
+        co, arrays.loop_verts, arrays.poly_loop_start, arrays.poly_loop_total))
+    tri_no = poly_no[tri_polys]
+
+    tri_co = co[tri_verts]
+    tri_min = tri_co.min(axis=1)
+    tri_max = tri_co.max(axis=1)
+    del tri_co
+    grid = _tri_grid_entries(tri_min, tri_max)
+
+    rng = np.random.default_rng(0)
+    for tri_start in range(0, len(tri_verts), chunk_size):
+        tri_index = np.arange(tri_start, min(tri_start + chunk_size, len(tri_verts)))
+        # Always draw the samples so the sequence doesn't depend on normals.
+        points = tri_points_random(co, tri_verts[tri_index], num_points, rng)
+
+        ray_tris = np.repeat(tri_index, num_points)
+        ray_no = tri_no[ray_tris]
+        # Zero area faces have no direction to cast in.
+        valid = ray_no.any(axis=1)
+        ray_tris = ray_tris[valid]
+        ray_no = ray_no[valid]
+
+        # Cast the ray backwards
+        origins = points[valid] - ray_no * EPS_BIAS
+        hits = segments_first_hit(
+            origins, origins - ray_no * distance, co, tri_verts, tri_min, tri_max, grid)
+
+        is_hit = hits != -1
+        # Add both the face we cast from and the face we hit.
+        faces_error[tri_polys[ray_tris[is_hit]]] = True
+        faces_error[tri_polys[hits[is_hit]]] = True
+
+    return index_array(faces_error)
+
+
+def tris_intersect(co_a, co_b):
+    """Exact intersection test of triangle pairs, (n, 3, 3) coordinate arrays."""
+    hit = np.zeros(len(co_a), dtype=bool)
+    for co_edge, co_tri in ((co_a, co_b), (co_b, co_a)):
+        v0, v1, v2 = co_tri[:, 0], co_tri[:, 1], co_tri[:, 2]
+        for i, j in ((0, 1), (1, 2), (2, 0)):
+            todo = ~hit
+            if not todo.any():
+                return hit
+            hit[todo] = _segments_cross_tris(
+                co_edge[todo, i], co_edge[todo, j], v0[todo], v1[todo], v2[todo])
+    return hit
+
+
+def run_steps(steps):
+    """Run a step generator (see check_self_intersect_steps) to the end, return its result."""
+    try:
+        while True:
+            next(steps)
+    except StopIteration as ex:
+        return ex.value
+
+
+def check_self_intersect(co, tri_verts, tri_polys, poly_len, chunk_size=262144):
+    """
+    Faces of intersecting triangles, returns an array of face index values.
+
+    A uniform grid over the triangle bounds is the broad phase, each
+    candidate pair is only generated in the one cell holding the minimum
+    corner of the pair's bounds overlap. Pairs sharing a vertex or a face
+    are skipped, the rest is tested exactly, ``chunk_size`` pairs at a time.
+    Coplanar overlaps are not reported.
+    """
+    return run_steps(check_self_intersect_steps(
+        co, tri_verts, tri_polys, poly_len, chunk_size))
+
+
+def check_self_intersect_steps(co, tri_verts, tri_polys, poly_len, chunk_size=262144):
+    """
+    check_self_intersect() as a generator yielding after every chunk,
+    the face index values are its return value.
+    """
+    faces_error = np.zeros(poly_len, dtype=bool)
+    if len(tri_verts) < 2:
+        return index_array(faces_error)
+
+    tri_co = co[tri_verts]
+    tri_min = tri_co.min(axis=1)
+    tri_max = tri_co.max(axis=1)
+
+    cell, origin, dims, keys, tri_sorted = _tri_grid_entries(tri_min, tri_max)
+
+    # Each entry pairs with the entries after it in the same cell.
+    group_end = np.searchsorted(keys, keys, side="right")
+    pair_counts = group_end - np.arange(len(keys)) - 1
+    pair_counts_cum = np.cumsum(pair_counts)
+
+    entry_start = 0
+    while entry_start < len(keys):
+        # At least one entry per chunk, otherwise up to chunk_size pairs.
+        pairs_done = pair_counts_cum[entry_start] - pair_counts[entry_start]
+        entry_end = int(np.searchsorted(
+            pair_counts_cum, pairs_done + chunk_size, side="right"))
+        entry_end = min(max(entry_end, entry_start + 1), len(keys))
+
+        entries = np.arange(entry_start, entry_end)
+        counts = pair_counts[entries]
+        entry_start = entry_end
+
+        total = int(counts.sum())
+        if not total:
+            continue
+        yield
+
+        pos_a = np.repeat(entries, counts)
+        pos_b = pos_a + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        a = tri_sorted[pos_a]
+        b = tri_sorted[pos_b]
+
+        # Bounds overlap, counted once in the cell holding the overlap minimum.
+        overlap_min = np.maximum(tri_min[a], tri_min[b])
+        keep = (overlap_min <= np.minimum(tri_max[a], tri_max[b])).all(axis=1)
+        cells = np.floor((overlap_min - origin) / cell).astype(np.int64)
+        cells = np.minimum(cells, dims - 1)
+        keep &= (cells[:, 0] + dims[0] * (cells[:, 1] + dims[1] * cells[:, 2])) == keys[pos_a]
+
+        # Skip pairs sharing topology.
+        keep &= tri_polys[a] != tri_polys[b]
+        verts_a = tri_verts[a]
+        verts_b = tri_verts[b]
+        keep &= ~(verts_a[:, :, None] == verts_b[:, None, :]).any(axis=(1, 2))
+
+        a = a[keep]
+        b = b[keep]
+        if not len(a):
+            continue
+
+        hit = tris_intersect(tri_co[a], tri_co[b])
+        faces_error[tri_polys[a[hit]]] = True
+        faces_error[tri_polys[b[hit]]] = True
+
+    return index_array(faces_error)
+
+
+def check_arrays(arrays, co_world, props):
+    """
+    Run every array based check of one mesh, used by the batch worker processes.
+
+    props: dict of the scene property values the checks read.
+    Returns {check name: results}, plus "mass" for the MassProperties.
+    """
+    topology = TopologyIndex(arrays)
+
+    angle_overhang = (np.pi / 2.0) - props["angle_overhang"]
+    if angle_overhang == np.pi:
+        overhang = None
+    else:
+        overhang = (check_overhang(co_world, arrays, angle_overhang),)
+
+    return {
+        "solid": check_solid(topology),
+        "intersect": (check_self_intersect(
+            arrays.co, arrays.tri_verts, arrays.tri_polys, len(arrays.poly_loop_start)),),
+        "degenerate": check_degenerate(arrays, props["threshold_zero"]),
+        "distorted": (check_distorted(co_world, arrays, props["angle_distort"]),),
+        "thick": (check_thick(co_world, arrays, props["thickness_min"]),),
+        "sharp": (check_sharp(co_world, arrays, topology, props["angle_sharp"]),),
+        "overhang": overhang,
+        "mass": mass_properties(co_world, arrays.tri_verts),
+    }
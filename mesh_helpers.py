@@ -4,6 +4,7 @@
 
 
 import bmesh
+import numpy as np
 
 
 def bmesh_copy_from_object(obj, transform=True, triangulate=True, apply_modifiers=False):
@@ -46,152 +47,585 @@ def bmesh_copy_from_object(obj, transform=True, triangulate=True, apply_modifier
     return bm
 
 
-def bmesh_from_object(obj):
-    """Object/Edit Mode get mesh, use bmesh_to_object() to write back."""
-    me = obj.data
+def mesh_arrays_from_object(obj):
+    """Read the mesh data into flat arrays with foreach_get (no modifiers, local space)."""
+    from .mesh_arrays import MeshArrays
+
+    assert obj.type == 'MESH'
 
     if obj.mode == 'EDIT':
-        bm = bmesh.from_edit_mesh(me)
+        # Edit-mode changes only reach the mesh data when flushed.
+        obj.update_from_editmode()
+
+    me = obj.data
+
+    co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", co)
+    edge_verts = np.empty(len(me.edges) * 2, dtype=np.int32)
+    me.edges.foreach_get("vertices", edge_verts)
+    loop_verts = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_verts)
+    loop_edges = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("edge_index", loop_edges)
+    poly_loop_start = np.empty(len(me.polygons), dtype=np.int32)
+    me.polygons.foreach_get("loop_start", poly_loop_start)
+    poly_loop_total = np.empty(len(me.polygons), dtype=np.int32)
+    me.polygons.foreach_get("loop_total", poly_loop_total)
+
+    me.calc_loop_triangles()
+    tri_verts = np.empty(len(me.loop_triangles) * 3, dtype=np.int32)
+    me.loop_triangles.foreach_get("vertices", tri_verts)
+    tri_polys = np.empty(len(me.loop_triangles), dtype=np.int32)
+    me.loop_triangles.foreach_get("polygon_index", tri_polys)
+
+    return MeshArrays(
+        co.reshape(-1, 3).astype(np.float64),
+        edge_verts.reshape(-1, 2),
+        loop_verts,
+        loop_edges,
+        poly_loop_start,
+        poly_loop_total,
+        tri_verts.reshape(-1, 3),
+        tri_polys,
+    )
+
+
+def mesh_select_elements(me, elem_type, indices):
+    """
+    Reveal the whole mesh and select only the given elements (object mode data).
+
+    elem_type is 'VERT', 'EDGE' or 'FACE', connected elements are selected
+    the way edit mode flushes a selection made in that select mode.
+    """
+    num_polys = len(me.polygons)
+
+    edge_verts = np.empty(len(me.edges) * 2, dtype=np.int32)
+    me.edges.foreach_get("vertices", edge_verts)
+    edge_verts = edge_verts.reshape(-1, 2)
+    loop_verts = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_verts)
+    loop_start = np.empty(num_polys, dtype=np.int32)
+    me.polygons.foreach_get("loop_start", loop_start)
+
+    vert_sel = np.zeros(len(me.vertices), dtype=bool)
+    edge_sel = np.zeros(len(me.edges), dtype=bool)
+    poly_sel = np.zeros(num_polys, dtype=bool)
+
+    if elem_type == 'FACE':
+        from .mesh_arrays import loop_polys
+
+        loop_total = np.empty(num_polys, dtype=np.int32)
+        me.polygons.foreach_get("loop_total", loop_total)
+        loop_edges = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get("edge_index", loop_edges)
+
+        poly_sel[indices] = True
+        loop_sel = poly_sel[loop_polys(loop_start, loop_total)]
+        vert_sel[loop_verts[loop_sel]] = True
+        edge_sel[loop_edges[loop_sel]] = True
+    elif elem_type == 'EDGE':
+        loop_edges = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get("edge_index", loop_edges)
+
+        edge_sel[indices] = True
+        vert_sel[edge_verts[edge_sel].ravel()] = True
+        if num_polys:
+            poly_sel = np.logical_and.reduceat(edge_sel[loop_edges], loop_start)
     else:
-        bm = bmesh.new()
-        bm.from_mesh(me)
+        vert_sel[indices] = True
+        edge_sel = vert_sel[edge_verts].all(axis=1)
+        if num_polys:
+            poly_sel = np.logical_and.reduceat(vert_sel[loop_verts], loop_start)
+
+    for seq, sel in (
+            (me.vertices, vert_sel),
+            (me.edges, edge_sel),
+            (me.polygons, poly_sel),
+    ):
+        seq.foreach_set("hide", np.zeros(len(sel), dtype=bool))
+        seq.foreach_set("select", sel)
+
+
+def mesh_write_check_attributes(obj, results):
+    """
+    Write check results as boolean mesh attributes, so they are saved with the file.
+
+    results: (attribute name, (elem_type, indices)) pairs, an empty result
+    removes the attribute.
+    """
+    import bpy
+    from . import cache
 
-    return bm
+    domains = {
+        'VERT': ('POINT', "vertices"),
+        'EDGE': ('EDGE', "edges"),
+        'FACE': ('FACE', "polygons"),
+    }
 
+    # Edit-mode would overwrite the attributes from the edit-mesh.
+    is_edit = obj.mode == 'EDIT'
+    if is_edit:
+        bpy.ops.object.mode_set(mode='OBJECT')
 
-def bmesh_to_object(obj, bm):
-    """Object/Edit Mode update the object."""
     me = obj.data
+    attributes = me.attributes
+    for name, data in results:
+        attr = attributes.get(name)
+        if attr is not None and not (
+                data and (attr.domain, attr.data_type) == (domains[data[0]][0], 'BOOLEAN')):
+            attributes.remove(attr)
+            attr = None
+        if not data:
+            continue
+
+        elem_type, indices = data
+        domain, seq_name = domains[elem_type]
+        if attr is None:
+            attr = attributes.new(name, 'BOOLEAN', domain)
+        mask = np.zeros(len(getattr(me, seq_name)), dtype=bool)
+        mask[indices] = True
+        attr.data.foreach_set("value", mask)
+
+    # Only attributes changed, keep the cached check results.
+    cache.hold((obj.name, me.name))
+    me.update()
+
+    if is_edit:
+        bpy.ops.object.mode_set(mode='EDIT')
+
+
+def mesh_offset_shell(objects, distance, use_even_offset=False):
+    """
+    Move the surface of the meshes ``distance`` along their normals
+    (world space, negative moves inwards), in object mode.
+
+    Meshes used by several of the objects are offset once.
+    """
+    from . import bounds, mesh_arrays
+
+    done = set()
+    for obj in objects:
+        if obj.type != 'MESH' or obj.data.name in done:
+            continue
+        assert obj.mode != 'EDIT'
+        done.add(obj.data.name)
 
-    if obj.mode == 'EDIT':
-        bmesh.update_edit_mesh(me, loop_triangles=True)
-    else:
-        bm.to_mesh(me)
+        me = obj.data
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        loop_verts = np.empty(len(me.loops), dtype=np.int32)
+        me.loops.foreach_get("vertex_index", loop_verts)
+        loop_start = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get("loop_start", loop_start)
+        loop_total = np.empty(len(me.polygons), dtype=np.int32)
+        me.polygons.foreach_get("loop_total", loop_total)
+
+        # Offset in world space, so the distance doesn't depend on the object scale.
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        co = co.reshape(-1, 3).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+        offsets = mesh_arrays.shell_offsets(
+            co, loop_verts, loop_start, loop_total, use_even_offset)
+        if np.linalg.det(matrix[:3, :3]) < 0.0:
+            # Mirrored, the winding (and so the normals) are flipped in world space.
+            offsets = -offsets
+        co += offsets * distance
+        co = (co - matrix[:3, 3]) @ np.linalg.inv(matrix[:3, :3]).T
+
+        me.vertices.foreach_set("co", co.astype(np.float32).ravel())
         me.update()
 
+    # The depsgraph handler only runs once the operator is done.
+    bounds.invalidate(done)
 
-def bmesh_calc_area(bm):
-    """Calculate the surface area."""
-    return sum(f.calc_area() for f in bm.faces)
 
+def objects_origin_set(objects, center='MEDIAN'):
+    """
+    Move the origin of the objects to the center of their geometry,
+    like ``bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY')`` for all of them at once.
 
-def bmesh_check_self_intersect_object(obj):
-    """Check if any faces self intersect returns an array of edge index values."""
-    import array
-    import mathutils
+    center: 'MEDIAN' (mean of the vertices) or 'BOUNDS' (center of the bounding box).
+    Meshes used by several objects are shifted once and all their users
+    (selected or not) are moved so nothing changes in the scene, children
+    stay in place. Other object types go through the operator in one call.
+    """
+    import bpy
+    from mathutils import Matrix, Vector
+    from . import bounds
+
+    assert center in {'MEDIAN', 'BOUNDS'}
+
+    meshes = {}
+    others = []
+    for obj in objects:
+        if obj.type == 'MESH' and obj.mode != 'EDIT':
+            meshes[obj.data.name] = obj.data
+        elif obj.type != 'MESH':
+            others.append(obj)
+
+    if others:
+        with bpy.context.temp_override(
+                selected_editable_objects=others, active_object=others[0], object=others[0]):
+            bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center=center)
+
+    if not meshes:
+        return
+
+    users = {}
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH' and obj.data.name in meshes:
+            users.setdefault(obj.data.name, []).append(obj)
+
+    for name, me in meshes.items():
+        if not len(me.vertices):
+            continue
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3).astype(np.float64)
+        if center == 'MEDIAN':
+            offset = co.mean(axis=0)
+        else:
+            offset = (co.min(axis=0) + co.max(axis=0)) / 2.0
+
+        co -= offset
+        me.vertices.foreach_set("co", co.astype(np.float32).ravel())
+        # Shape keys move with the vertices, or the basis drifts from the other keys.
+        if me.shape_keys is not None:
+            for key_block in me.shape_keys.key_blocks:
+                key_co = np.empty(len(key_block.data) * 3, dtype=np.float32)
+                key_block.data.foreach_get("co", key_co)
+                key_co = key_co.reshape(-1, 3).astype(np.float64) - offset
+                key_block.data.foreach_set("co", key_co.astype(np.float32).ravel())
+        me.update()
 
-    if not obj.data.polygons:
-        return array.array('i', ())
+        offset = Vector(offset.tolist())
+        # The children of a moved object are moved back through their parent inverse.
+        offset_inverse = Matrix.Translation(-offset)
+        for obj in users[name]:
+            matrix = obj.matrix_world.copy()
+            matrix.translation = matrix @ offset
+            obj.matrix_world = matrix
+            for child in obj.children:
+                child.matrix_parent_inverse = offset_inverse @ child.matrix_parent_inverse
 
-    bm = bmesh_copy_from_object(obj, transform=False, triangulate=False)
-    tree = mathutils.bvhtree.BVHTree.FromBMesh(bm, epsilon=0.00001)
-    overlap = tree.overlap(tree)
-    faces_error = {i for i_pair in overlap for i in i_pair}
+    # The depsgraph handler only runs once the operator is done.
+    bounds.invalidate(meshes.keys())
 
-    return array.array('i', faces_error)
 
+def mesh_from_polygons(name, co, loop_verts, loop_total):
+    """Create a new mesh from (n, 3) coordinates, the vertex of every loop and polygon sizes."""
+    import bpy
 
-def bmesh_face_points_random(f, num_points=1, margin=0.05):
-    import random
-    from random import uniform
+    loop_start = np.zeros(len(loop_total), dtype=np.int32)
+    np.cumsum(loop_total[:-1], out=loop_start[1:])
+
+    me = bpy.data.meshes.new(name)
+    me.vertices.add(len(co))
+    me.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    me.loops.add(len(loop_verts))
+    me.loops.foreach_set("vertex_index", np.ascontiguousarray(loop_verts, dtype=np.int32))
+    me.polygons.add(len(loop_total))
+    me.polygons.foreach_set("loop_start", loop_start)
+    me.polygons.foreach_set("loop_total", np.ascontiguousarray(loop_total, dtype=np.int32))
+    me.update(calc_edges=True)
+    return me
+
+
+def mesh_from_quads(name, co, faces):
+    """Create a new mesh from (n, 3) coordinates and (m, 4) quad vertex indices."""
+    return mesh_from_polygons(
+        name, co, faces.ravel(), np.full(len(faces), 4, dtype=np.int32))
+
+
+def mesh_polygon_arrays(me):
+    """Read (co, loop_verts, loop_total) of a mesh, see mesh_from_polygons()."""
+    co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", co)
+    loop_verts = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_verts)
+    loop_total = np.empty(len(me.polygons), dtype=np.int32)
+    me.polygons.foreach_get("loop_total", loop_total)
+    return co.reshape(-1, 3), loop_verts, loop_total
+
+
+def mesh_fingerprint(obj):
+    """
+    Cheap key of the mesh geometry: element counts and a checksum of the
+    coordinates, edge vertices and loop vertices (so reconnecting the same
+    vertices changes it too).
+    """
+    import zlib
 
-    # for pradictable results
-    random.seed(f.index)
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
 
-    uniform_args = 0.0 + margin, 1.0 - margin
-    vecs = [v.co for v in f.verts]
+    me = obj.data
+    co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", co)
+    edge_verts = np.empty(len(me.edges) * 2, dtype=np.int32)
+    me.edges.foreach_get("vertices", edge_verts)
+    loop_verts = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_verts)
+
+    crc = zlib.crc32(co.tobytes())
+    crc = zlib.crc32(edge_verts.tobytes(), crc)
+    crc = zlib.crc32(loop_verts.tobytes(), crc)
+    return (
+        len(me.vertices),
+        len(me.edges),
+        len(me.loops),
+        len(me.polygons),
+        crc,
+    )
+
+
+def mesh_triangles_evaluated(obj, depsgraph=None):
+    """Return world-space (co, tri_verts) arrays of the evaluated mesh (modifiers applied)."""
+    import bpy
 
-    for _ in range(num_points):
-        u1 = uniform(*uniform_args)
-        u2 = uniform(*uniform_args)
-        u_tot = u1 + u2
+    assert obj.type == 'MESH'
 
-        if u_tot > 1.0:
-            u1 = 1.0 - u1
-            u2 = 1.0 - u2
+    if obj.mode == 'EDIT':
+        obj.update_from_editmode()
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
 
-        side1 = vecs[1] - vecs[0]
-        side2 = vecs[2] - vecs[0]
+    obj_eval = obj.evaluated_get(depsgraph)
+    me = obj_eval.to_mesh()
+    try:
+        me.calc_loop_triangles()
+        co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        tri_verts = np.empty(len(me.loop_triangles) * 3, dtype=np.int32)
+        me.loop_triangles.foreach_get("vertices", tri_verts)
+    finally:
+        obj_eval.to_mesh_clear()
 
-        yield vecs[0] + u1 * side1 + u2 * side2
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    co = co.reshape(-1, 3).astype(np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+    return co, tri_verts.reshape(-1, 3)
 
 
-def bmesh_check_thick_object(obj, thickness):
-    import array
-    import bpy
+def mesh_mass_properties(obj, depsgraph=None):
+    """Volume, area, centroid and inertia of the evaluated world-space mesh."""
+    from .mesh_arrays import mass_properties
+    return mass_properties(*mesh_triangles_evaluated(obj, depsgraph))
 
-    # Triangulate
-    bm = bmesh_copy_from_object(obj, transform=True, triangulate=False)
 
-    # map original faces to their index.
-    face_index_map_org = {f: i for i, f in enumerate(bm.faces)}
-    ret = bmesh.ops.triangulate(bm, faces=bm.faces)
-    face_map = ret["face_map"]
-    del ret
-    # old edge -> new mapping
+class MeshSnapshot:
+    """
+    Mesh data shared between checks, each part is built at most once.
 
-    # Convert new/old map to index dict.
+    arrays: flat local-space arrays, see mesh_arrays_from_object().
+    co_world: world-space vertex coordinates of arrays.
+    topology: edge/face adjacency, see mesh_arrays.TopologyIndex.
+    fingerprint: see mesh_fingerprint().
 
-    # Create a real mesh (lame!)
-    context = bpy.context
-    layer = context.view_layer
-    scene_collection = context.layer_collection.collection
+    Call free() once all checks ran.
+    """
 
-    me_tmp = bpy.data.meshes.new(name="~temp~")
-    bm.to_mesh(me_tmp)
-    obj_tmp = bpy.data.objects.new(name=me_tmp.name, object_data=me_tmp)
-    scene_collection.objects.link(obj_tmp)
+    def __init__(self, obj):
+        self.obj = obj
+        self._arrays = None
+        self._co_world = None
+        self._topology = None
+        self._fingerprint = None
 
-    layer.update()
-    ray_cast = obj_tmp.ray_cast
+    @property
+    def arrays(self):
+        if self._arrays is None:
+            self._arrays = mesh_arrays_from_object(self.obj)
+        return self._arrays
 
-    EPS_BIAS = 0.0001
+    @property
+    def co_world(self):
+        if self._co_world is None:
+            matrix = np.array(self.obj.matrix_world, dtype=np.float64)
+            self._co_world = self.arrays.co @ matrix[:3, :3].T + matrix[:3, 3]
+        return self._co_world
+
+    @property
+    def topology(self):
+        if self._topology is None:
+            from .mesh_arrays import TopologyIndex
+            self._topology = TopologyIndex(self.arrays)
+        return self._topology
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = mesh_fingerprint(self.obj)
+        return self._fingerprint
+
+    def free(self):
+        self._arrays = self._co_world = self._topology = None
+
+
+def bmesh_from_object(obj):
+    """Object/Edit Mode get mesh, use bmesh_to_object() to write back."""
+    me = obj.data
+
+    if obj.mode == 'EDIT':
+        bm = bmesh.from_edit_mesh(me)
+    else:
+        bm = bmesh.new()
+        bm.from_mesh(me)
 
-    faces_error = set()
-    bm_faces_new = bm.faces[:]
+    return bm
 
-    for f in bm_faces_new:
-        no = f.normal
-        no_sta = no * EPS_BIAS
-        no_end = no * thickness
-        for p in bmesh_face_points_random(f, num_points=6):
-            # Cast the ray backwards
-            p_a = p - no_sta
-            p_b = p - no_end
-            p_dir = p_b - p_a
 
-            ok, _co, no, index = ray_cast(p_a, p_dir, distance=p_dir.length)
+def bmesh_to_object(obj, bm):
+    """Object/Edit Mode update the object."""
+    me = obj.data
 
-            if ok:
-                # Add the face we hit
-                for f_iter in (f, bm_faces_new[index]):
-                    # if the face wasn't triangulated, just use existing
-                    f_org = face_map.get(f_iter, f_iter)
-                    f_org_index = face_index_map_org[f_org]
-                    faces_error.add(f_org_index)
+    if obj.mode == 'EDIT':
+        bmesh.update_edit_mesh(me, loop_triangles=True)
+    else:
+        from . import bounds
 
-    bm.free()
+        bm.to_mesh(me)
+        me.update()
+        bounds.invalidate((me.name,))
+
+
+def mesh_check_thick(arrays, co_world, thickness, num_points=6, chunk_size=65536):
+    """
+    Check for faces thinner than ``thickness``, returns an array of face index values.
 
-    scene_collection.objects.unlink(obj_tmp)
-    bpy.data.objects.remove(obj_tmp)
-    bpy.data.meshes.remove(me_tmp)
+    Rays are cast backwards from random points on every loop triangle
+    against a BVH tree of the world-space triangles, no scene data is created.
+    Sampling uses a fixed seed so results are repeatable.
+    """
+    from . import mesh_arrays
 
-    layer.update()
+    return mesh_arrays.run_steps(mesh_check_thick_steps(
+        arrays, co_world, thickness, num_points, chunk_size))
 
-    return array.array('i', faces_error)
 
+def mesh_check_thick_steps(arrays, co_world, thickness, num_points=6, chunk_size=65536):
+    """
+    mesh_check_thick() as a generator yielding after every chunk of triangles,
+    the face index values are its return value.
+    """
+    from mathutils.bvhtree import BVHTree
+    from . import mesh_arrays
 
-def face_is_distorted(ele, angle_distort):
-    no = ele.normal
-    angle_fn = no.angle
+    tri_verts = arrays.tri_verts
+    tri_polys = arrays.tri_polys
 
-    for loop in ele.loops:
-        loopno = loop.calc_normal()
+    if not len(tri_verts):
+        return mesh_arrays.index_array(())
 
-        if loopno.dot(no) < 0.0:
-            loopno.negate()
+    tree = BVHTree.FromPolygons(
+        co_world.tolist(), tri_verts.tolist(), all_triangles=True)
+    ray_cast = tree.ray_cast
 
-        if angle_fn(loopno, 1000.0) > angle_distort:
-            return True
+    poly_no, _ = mesh_arrays.normalized(mesh_arrays.polygon_normals(
+        co_world, arrays.loop_verts, arrays.poly_loop_start, arrays.poly_loop_total))
+    tri_no = poly_no[tri_polys]
 
-    return False
+    EPS_BIAS = 0.0001
+    distance = thickness - EPS_BIAS
+    if distance <= 0.0:
+        return mesh_arrays.index_array(())
+
+    faces_error = np.zeros(len(arrays.poly_loop_start), dtype=bool)
+    rng = np.random.default_rng(0)
+
+    for tri_start in range(0, len(tri_verts), chunk_size):
+        yield
+        tri_index = np.arange(
+            tri_start, min(tri_start + chunk_size, len(tri_verts)))
+        # Always draw the samples so the sequence doesn't depend on normals.
+        points = mesh_arrays.tri_points_random(
+            co_world, tri_verts[tri_index], num_points, rng)
+
+        ray_tris = np.repeat(tri_index, num_points)
+        ray_no = tri_no[ray_tris]
+        # Zero area faces have no direction to cast in.
+        valid = ray_no.any(axis=1)
+        ray_tris = ray_tris[valid]
+        ray_no = ray_no[valid]
+
+        # Cast the ray backwards
+        origins = points[valid] - ray_no * EPS_BIAS
+        hits = np.array([
+            -1 if index is None else index
+            for _co, _no, index, _dist in (
+                ray_cast(p_a, p_dir, distance)
+                for p_a, p_dir in zip(origins.tolist(), (-ray_no).tolist())
+            )
+        ], dtype=np.int64)
+
+        if not len(hits):
+            continue
+
+        is_hit = hits != -1
+        # Add both the face we cast from and the face we hit.
+        faces_error[tri_polys[ray_tris[is_hit]]] = True
+        faces_error[tri_polys[hits[is_hit]]] = True
+
+    return mesh_arrays.index_array(faces_error)
+
+
+def mesh_thickness_samples(arrays, co_world, num_samples=2000, seed=0):
+    """
+    Sample the wall thickness at random surface points (picked by area).
+
+    Returns the distance to the opposite side for each sample,
+    inf where the backwards ray hits nothing (open meshes).
+    """
+    from . import mesh_arrays
+
+    return mesh_arrays.run_steps(mesh_thickness_samples_steps(
+        arrays, co_world, num_samples, seed))
+
+
+def mesh_thickness_samples_steps(arrays, co_world, num_samples=2000, seed=0, chunk_size=256):
+    """
+    mesh_thickness_samples() as a generator yielding between the stages
+    and chunks of rays, the distances are its return value.
+    """
+    from mathutils.bvhtree import BVHTree
+    from . import mesh_arrays
+
+    tri_verts = arrays.tri_verts
+    if not len(tri_verts):
+        return np.zeros(0)
+
+    poly_no, _ = mesh_arrays.normalized(mesh_arrays.polygon_normals(
+        co_world, arrays.loop_verts, arrays.poly_loop_start, arrays.poly_loop_total))
+    tri_no = poly_no[arrays.tri_polys]
+
+    _tri_unit, tri_areas = mesh_arrays.normalized(np.cross(
+        co_world[tri_verts[:, 1]] - co_world[tri_verts[:, 0]],
+        co_world[tri_verts[:, 2]] - co_world[tri_verts[:, 0]]))
+    tri_areas[~tri_no.any(axis=1)] = 0.0
+    if not tri_areas.any():
+        return np.zeros(0)
+
+    rng = np.random.default_rng(seed)
+    tri_index = rng.choice(
+        len(tri_verts), size=num_samples, p=tri_areas / tri_areas.sum())
+    points = mesh_arrays.tri_points_random(co_world, tri_verts[tri_index], 1, rng)
+    ray_no = tri_no[tri_index]
+    yield
+
+    tree = BVHTree.FromPolygons(
+        co_world.tolist(), tri_verts.tolist(), all_triangles=True)
+    ray_cast = tree.ray_cast
+    yield
+
+    EPS_BIAS = 0.0001
+    origins = points - ray_no * EPS_BIAS
+    dists = np.empty(num_samples)
+    for start in range(0, num_samples, chunk_size):
+        end = min(start + chunk_size, num_samples)
+        dists[start:end] = [
+            np.inf if dist is None else dist + EPS_BIAS
+            for _co, _no, _index, dist in (
+                ray_cast(p_a, p_dir)
+                for p_a, p_dir in zip(origins[start:end].tolist(), (-ray_no[start:end]).tolist())
+            )
+        ]
+        yield
+    return dists
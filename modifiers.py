@@ -1,5 +1,128 @@
 import bpy
-from typing import Tuple
+import math
+from typing import Sequence, Tuple
+
+# Apply modifiers without bpy.ops.object.modifier_apply:
+# the whole stack is evaluated once through the depsgraph and
+# the result is written back to the mesh, no context override needed.
+
+
+def apply_modifiers_direct(blender_py_lib: bpy,
+                           target_object: bpy.types.Object,
+                           stack: Sequence[Tuple[str, str, dict]],
+                           ) -> bpy.types.Object:
+    """
+      apply a stack of temporary modifiers to the mesh in one evaluation
+
+      :param blender_py_lib: bpy
+      :param target_object: bpy.types.Object (mesh, object mode)
+      :param stack: (modifier_name, modifier_type, {property: value}) in order
+      :return: bpy.types.Object
+    """
+    import bmesh
+    from . import bounds
+
+    # like modifier_apply, existing modifiers don't change the result
+    disabled = [
+        modifier for modifier in target_object.modifiers if modifier.show_viewport]
+    for modifier in disabled:
+        modifier.show_viewport = False
+
+    added = []
+    try:
+        for modifier_name, modifier_type, settings in stack:
+            modifier = target_object.modifiers.new(
+                name=modifier_name, type=modifier_type)
+            added.append(modifier)
+            for key, value in settings.items():
+                setattr(modifier, key, value)
+
+        depsgraph = blender_py_lib.context.evaluated_depsgraph_get()
+        object_eval = target_object.evaluated_get(depsgraph)
+        mesh_eval = object_eval.to_mesh()
+        try:
+            bm = bmesh.new()
+            bm.from_mesh(mesh_eval)
+        finally:
+            object_eval.to_mesh_clear()
+    finally:
+        for modifier in added:
+            target_object.modifiers.remove(modifier)
+        for modifier in disabled:
+            modifier.show_viewport = True
+
+    bm.to_mesh(target_object.data)
+    bm.free()
+    target_object.data.update()
+    bounds.invalidate((target_object.data.name,))
+    return target_object
+
+
+# Rough costs of a voxel remesh, OpenVDB only stores voxels in a narrow
+# band around the surface so everything scales with area / voxel_size².
+REMESH_BAND_VOXELS = 6
+REMESH_BYTES_PER_VOXEL = 16
+REMESH_BYTES_PER_FACE = 200
+REMESH_SECONDS_PER_VOXEL = 2.5e-7
+
+
+class RemeshEstimate:
+    """Predicted cost of a voxel remesh, see remesh_estimate()."""
+
+    __slots__ = ("voxel_size", "dimensions", "voxels", "faces", "memory", "seconds")
+
+    def __init__(self, voxel_size, dimensions, voxels, faces, memory, seconds):
+        self.voxel_size = voxel_size
+        # voxel grid size on each axis
+        self.dimensions = dimensions
+        # voxels stored in the narrow band
+        self.voxels = voxels
+        self.faces = faces
+        # bytes
+        self.memory = memory
+        self.seconds = seconds
+
+    def over_budget(self, memory_max, faces_max):
+        """How many times the larger of both budgets is exceeded (<= 1.0 fits)."""
+        return max(self.memory / memory_max, self.faces / faces_max)
+
+
+def remesh_estimate(dimensions: Tuple[float, float, float],
+                    voxel_size: float,
+                    area: float = None,
+                    ) -> RemeshEstimate:
+    """
+      predict a voxel remesh before running it
+
+      :param dimensions: size of the object bounds
+      :param voxel_size: remesh voxel size
+      :param area: surface area, the area of the bounds when None
+      :return: RemeshEstimate
+    """
+    x, y, z = dimensions
+    if area is None:
+        area = 2.0 * (x * y + y * z + z * x)
+
+    grid = tuple(math.ceil(size / voxel_size) + 1 for size in dimensions)
+    faces = area / (voxel_size * voxel_size)
+    voxels = faces * REMESH_BAND_VOXELS
+    return RemeshEstimate(
+        voxel_size,
+        grid,
+        int(voxels),
+        int(faces),
+        int(voxels * REMESH_BYTES_PER_VOXEL + faces * REMESH_BYTES_PER_FACE),
+        voxels * REMESH_SECONDS_PER_VOXEL,
+    )
+
+
+def remesh_fit_budget(estimate: RemeshEstimate, memory_max: float, faces_max: float) -> float:
+    """Smallest voxel size whose estimate fits both budgets."""
+    over = estimate.over_budget(memory_max, faces_max)
+    if over <= 1.0:
+        return estimate.voxel_size
+    # costs scale with 1 / voxel_size²
+    return estimate.voxel_size * math.sqrt(over) * 1.01
 
 
 def remesh_direct(blender_py_lib: bpy,
@@ -8,14 +131,12 @@ def remesh_direct(blender_py_lib: bpy,
                   voxel_size=0.3,
                   modifier_name='TMP_REMESH_MODIFIER'
                   ) -> bpy.types.Object:
-
-    remesh_modifier: bpy.types.Modifier = target_object.modifiers.new(
-        name=modifier_name, type='REMESH')
-    remesh_modifier.mode = mode
-    remesh_modifier.voxel_size = voxel_size
-    blender_py_lib.ops.object.modifier_apply(
-        {"object": target_object}, modifier=modifier_name)
-    return target_object
+    return apply_modifiers_direct(blender_py_lib, target_object, [
+        (modifier_name, 'REMESH', {
+            "mode": mode,
+            "voxel_size": voxel_size,
+        }),
+    ])
 
 
 def solidify_direct(blender_py_lib: bpy,
@@ -23,14 +144,12 @@ def solidify_direct(blender_py_lib: bpy,
                     thickness=0.7,
                     modifier_name='TMP_SOLIDIFY_MODIFIER'
                     ) -> bpy.types.Object:
-    solidify_modifier = target_object.modifiers.new(
-        name=modifier_name, type='SOLIDIFY')
-    solidify_modifier.thickness = thickness
-    solidify_modifier.offset = 0.0
-    blender_py_lib.context.view_layer.update()
-    blender_py_lib.ops.object.modifier_apply(
-        {"object": target_object}, modifier=modifier_name)
-    return target_object
+    return apply_modifiers_direct(blender_py_lib, target_object, [
+        (modifier_name, 'SOLIDIFY', {
+            "thickness": thickness,
+            "offset": 0.0,
+        }),
+    ])
 
 
 def decimate_direct(blender_py_lib: bpy,
@@ -38,13 +157,11 @@ def decimate_direct(blender_py_lib: bpy,
                     ratio=0.5,
                     modifier_name='TMP_DECIMATE_MODIFIER'
                     ) -> bpy.types.Object:
-    decimate_modifier = target_object.modifiers.new(
-        name=modifier_name, type='DECIMATE')
-    decimate_modifier.ratio = ratio
-    blender_py_lib.context.view_layer.update()
-    blender_py_lib.ops.object.modifier_apply(
-        {"object": target_object}, modifier=modifier_name)
-    return target_object
+    return apply_modifiers_direct(blender_py_lib, target_object, [
+        (modifier_name, 'DECIMATE', {
+            "ratio": ratio,
+        }),
+    ])
 
 
 def shrinkwrap_project_direct(
@@ -61,17 +178,10 @@ def shrinkwrap_project_direct(
         modifier_name='TMP_SHRINKWRAP_MODIFIER',
 
 ) -> Tuple[bpy.types.Object, bpy.types.Object]:
-    shrinkwrap_modifier = source_object.modifiers.new(
-        name=modifier_name, type='SHRINKWRAP')
-
-    shrinkwrap_modifier.target = target_object
-    shrinkwrap_modifier.wrap_method = options['wrap_method']
-    shrinkwrap_modifier.use_negative_direction = options['use_negative_direction']
-    shrinkwrap_modifier.use_positive_direction = options['use_positive_direction']
-    shrinkwrap_modifier.project_limit = options['project_limit']
-    shrinkwrap_modifier.use_project_z = options['use_project_z']
-
-    blender_py_lib.context.view_layer.update()
-    blender_py_lib.ops.object.modifier_apply(
-        {"object": source_object}, modifier=modifier_name)
+    apply_modifiers_direct(blender_py_lib, source_object, [
+        (modifier_name, 'SHRINKWRAP', {
+            "target": target_object,
+            **options,
+        }),
+    ])
     return (source_object, target_object)
@@ -2,12 +2,13 @@
 
 # All Operator
 import math
-from mathutils import Vector, Matrix
+from mathutils import Vector
 
 import bpy
 from bpy.app.translations import pgettext_tip as tip_
 from bpy.types import Operator
 from bpy.props import (
+    BoolProperty,
     IntProperty,
     FloatProperty,
 )
@@ -80,9 +81,8 @@ class MESH_OT_stk_tools_info_volume(Operator):
         scale = 1.0 if unit.system == 'NONE' else unit.scale_length
         obj = context.active_object
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, apply_modifiers=True)
-        volume = bm.calc_volume()
-        bm.free()
+        fingerprint = mesh_helpers.mesh_fingerprint(obj)
+        volume = abs(mesh_helpers.mesh_mass_properties(obj).volume)
 
         if unit.system == 'NONE':
             volume_fmt = clean_float(volume, 8)
@@ -93,7 +93,8 @@ class MESH_OT_stk_tools_info_volume(Operator):
             volume_str = clean_float(volume_unit, 4)
             volume_fmt = f"{volume_str} {symbol}"
 
-        report.update((tip_("体积: {}³").format(volume_fmt), None))
+        report.update(obj, (tip_("体积: {}³").format(volume_fmt), None),
+                      fingerprint=fingerprint)
 
         return {'FINISHED'}
 
@@ -111,9 +112,8 @@ class MESH_OT_stk_tools_info_area(Operator):
         scale = 1.0 if unit.system == 'NONE' else unit.scale_length
         obj = context.active_object
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, apply_modifiers=True)
-        area = mesh_helpers.bmesh_calc_area(bm)
-        bm.free()
+        fingerprint = mesh_helpers.mesh_fingerprint(obj)
+        area = mesh_helpers.mesh_mass_properties(obj).area
 
         if unit.system == 'NONE':
             area_fmt = clean_float(area, 8)
@@ -124,7 +124,8 @@ class MESH_OT_stk_tools_info_area(Operator):
             area_str = clean_float(area_unit, 4)
             area_fmt = f"{area_str} {symbol}"
 
-        report.update((tip_("面积: {}²").format(area_fmt), None))
+        report.update(obj, (tip_("面积: {}²").format(area_fmt), None),
+                      fingerprint=fingerprint)
 
         return {'FINISHED'}
 
@@ -132,12 +133,71 @@ class MESH_OT_stk_tools_info_area(Operator):
 # ---------------
 # Geometry Checks
 
+def iter_checks(obj, check_cls, stk_tools_props, snapshot=None, steps=False):
+    """
+    Run the checks on one shared snapshot, yielding the info list of each check.
+
+    Results of unchanged meshes come from the cache. A snapshot passed in
+    is not freed. With ``steps``, None is yielded between the chunks of
+    work of checks that have a check_steps() generator.
+    """
+    from . import mesh_helpers, cache
+
+    owns_snapshot = snapshot is None
+    if owns_snapshot:
+        snapshot = mesh_helpers.MeshSnapshot(obj)
+    try:
+        for cls in check_cls:
+            key = cache.check_key(
+                cls, obj, snapshot.fingerprint, stk_tools_props)
+            cls_info = cache.get(key)
+            if cls_info is None:
+                cls_info = []
+                check_steps = getattr(cls, "check_steps", None)
+                if steps and check_steps is not None:
+                    for _ in check_steps(obj, cls_info, snapshot):
+                        yield None
+                else:
+                    cls.main_check(obj, cls_info, snapshot)
+                cache.put(key, cls_info)
+            yield cls_info
+    finally:
+        if owns_snapshot:
+            snapshot.free()
+
+
+def store_results(obj, check_cls, infos, stk_tools_props, fingerprint=None):
+    """
+    Update the report of an object from the info lists of ``check_cls``,
+    also writing them as mesh attributes when enabled.
+    """
+    from . import mesh_helpers
+
+    report.update(
+        obj, *(line for cls_info in infos for line in cls_info), fingerprint=fingerprint)
+
+    if stk_tools_props.use_check_attributes:
+        mesh_helpers.mesh_write_check_attributes(obj, [
+            (name, data)
+            for cls, cls_info in zip(check_cls, infos)
+            for name, (_text, data) in zip(cls.attribute_names, cls_info)
+        ])
+
+
 def execute_check(self, context):
+    from . import mesh_helpers
+
     obj = context.active_object
+    check_cls = (type(self),)
+    stk_tools_props = context.scene.stk_tools_props
 
-    info = []
-    self.main_check(obj, info)
-    report.update(*info)
+    snapshot = mesh_helpers.MeshSnapshot(obj)
+    try:
+        infos = list(iter_checks(obj, check_cls, stk_tools_props, snapshot=snapshot))
+        store_results(obj, check_cls, infos, stk_tools_props,
+                      fingerprint=snapshot.fingerprint)
+    finally:
+        snapshot.free()
 
     multiple_obj_warning(self, context)
 
@@ -154,32 +214,32 @@ class MESH_OT_stk_tools_check_solid(Operator):
     bl_idname = "mesh.stk_tools_check_solid"
     bl_label = "3D-Print-STK Check Solid"
     bl_description = "Check for geometry is solid (has valid inside/outside) and correct normals"
+    bl_options = {'REGISTER', 'UNDO'}
 
-    @staticmethod
-    def main_check(obj, info):
-        import array
-        from . import mesh_helpers
-
-        bm = mesh_helpers.bmesh_copy_from_object(
-            obj, transform=False, triangulate=False)
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "solid"
+    # Scene properties the result depends on.
+    check_props = ()
+    # Mesh attribute of each info line, see store_results().
+    attribute_names = ("stk_non_manifold", "stk_non_contiguous")
 
-        edges_non_manifold = array.array(
-            'i', (i for i, ele in enumerate(bm.edges) if not ele.is_manifold))
-        edges_non_contig = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.edges)
-             if ele.is_manifold and (not ele.is_contiguous)),
-        )
+    @staticmethod
+    def append_info(info, results):
+        edges_non_manifold, edges_non_contig = results
 
         info.append(
             (tip_("没有 Manifold 的边: {}").format(
                 len(edges_non_manifold)),
-                (bmesh.types.BMEdge,
+                ('EDGE',
                  edges_non_manifold)))
         info.append((tip_("坏的相邻的边: {}").format(
-            len(edges_non_contig)), (bmesh.types.BMEdge, edges_non_contig)))
+            len(edges_non_contig)), ('EDGE', edges_non_contig)))
 
-        bm.free()
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
+
+        cls.append_info(info, mesh_arrays.check_solid(snapshot.topology))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -189,14 +249,40 @@ class MESH_OT_stk_tools_check_intersections(Operator):
     bl_idname = "mesh.stk_tools_check_intersect"
     bl_label = "3D-Print-STK Check Intersections"
     bl_description = "Check geometry for self intersections"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "intersect"
+    # Scene properties the result depends on.
+    check_props = ()
+    attribute_names = ("stk_intersect",)
 
     @staticmethod
-    def main_check(obj, info):
-        from . import mesh_helpers
+    def append_info(info, results):
+        faces_intersect, = results
 
-        faces_intersect = mesh_helpers.bmesh_check_self_intersect_object(obj)
         info.append((tip_("相交面: {}").format(
-            len(faces_intersect)), (bmesh.types.BMFace, faces_intersect)))
+            len(faces_intersect)), ('FACE', faces_intersect)))
+
+    @classmethod
+    def check_steps(cls, obj, info, snapshot):
+        """main_check() yielding between chunks of work, see iter_checks()."""
+        from . import mesh_arrays
+
+        arrays = snapshot.arrays
+        faces_intersect = yield from mesh_arrays.check_self_intersect_steps(
+            arrays.co, arrays.tri_verts, arrays.tri_polys, len(arrays.poly_loop_start),
+            chunk_size=65536)
+        cls.append_info(info, (faces_intersect,))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
+
+        arrays = snapshot.arrays
+        faces_intersect = mesh_arrays.check_self_intersect(
+            arrays.co, arrays.tri_verts, arrays.tri_polys, len(arrays.poly_loop_start))
+        cls.append_info(info, (faces_intersect,))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -209,30 +295,33 @@ class MESH_OT_stk_tools_check_degenerate(Operator):
         "Check for degenerate geometry that may not print properly "
         "(zero area faces, zero length edges)"
     )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "degenerate"
+    # Scene properties the result depends on.
+    check_props = ("threshold_zero",)
+    attribute_names = ("stk_zero_faces", "stk_zero_edges")
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-        from . import mesh_helpers
+    def append_info(info, results):
+        faces_zero, edges_zero = results
+
+        info.append((tip_("Zero 面: {}").format(
+            len(faces_zero)), ('FACE', faces_zero)))
+        info.append((tip_("Zero 边: {}").format(
+            len(edges_zero)), ('EDGE', edges_zero)))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
 
         scene = bpy.context.scene
         stk_tools_props = scene.stk_tools_props
         threshold = stk_tools_props.threshold_zero
 
-        bm = mesh_helpers.bmesh_copy_from_object(
-            obj, transform=False, triangulate=False)
-
-        faces_zero = array.array('i', (i for i, ele in enumerate(
-            bm.faces) if ele.calc_area() <= threshold))
-        edges_zero = array.array('i', (i for i, ele in enumerate(
-            bm.edges) if ele.calc_length() <= threshold))
-
-        info.append((tip_("Zero 面: {}").format(
-            len(faces_zero)), (bmesh.types.BMFace, faces_zero)))
-        info.append((tip_("Zero 边: {}").format(
-            len(edges_zero)), (bmesh.types.BMEdge, edges_zero)))
-
-        bm.free()
+        cls.append_info(info, mesh_arrays.check_degenerate(
+            snapshot.arrays, threshold))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -242,30 +331,32 @@ class MESH_OT_stk_tools_check_distorted(Operator):
     bl_idname = "mesh.stk_tools_check_distort"
     bl_label = "3D-Print-STK Check Distorted Faces"
     bl_description = "Check for non-flat faces"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "distorted"
+    # Scene properties the result depends on.
+    check_props = ("angle_distort",)
+    attribute_names = ("stk_distorted",)
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-        from . import mesh_helpers
+    def append_info(info, results):
+        faces_distort, = results
+
+        info.append((tip_("非平坦的面: {}").format(len(faces_distort)),
+                    ('FACE', faces_distort)))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
 
         scene = bpy.context.scene
         stk_tools_props = scene.stk_tools_props
         angle_distort = stk_tools_props.angle_distort
 
-        bm = mesh_helpers.bmesh_copy_from_object(
-            obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        faces_distort = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.faces)
-             if mesh_helpers.face_is_distorted(ele, angle_distort))
-        )
-
-        info.append((tip_("非平坦的面: {}").format(len(faces_distort)),
-                    (bmesh.types.BMFace, faces_distort)))
-
-        bm.free()
+        faces_distort = mesh_arrays.check_distorted(
+            snapshot.co_world, snapshot.arrays, angle_distort)
+        cls.append_info(info, (faces_distort,))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -278,18 +369,44 @@ class MESH_OT_stk_tools_check_thick(Operator):
         "Check geometry is above the minimum thickness preference "
         "(relies on correct normals)"
     )
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "thick"
+    # Scene properties the result depends on.
+    check_props = ("thickness_min",)
+    attribute_names = ("stk_thin",)
 
     @staticmethod
-    def main_check(obj, info):
+    def append_info(info, results):
+        faces_error, = results
+
+        info.append((tip_("（减）薄面: {}").format(
+            len(faces_error)), ('FACE', faces_error)))
+
+    @classmethod
+    def check_steps(cls, obj, info, snapshot):
+        """main_check() yielding between chunks of work, see iter_checks()."""
         from . import mesh_helpers
 
         scene = bpy.context.scene
         stk_tools_props = scene.stk_tools_props
 
-        faces_error = mesh_helpers.bmesh_check_thick_object(
-            obj, stk_tools_props.thickness_min)
-        info.append((tip_("（减）薄面: {}").format(
-            len(faces_error)), (bmesh.types.BMFace, faces_error)))
+        faces_error = yield from mesh_helpers.mesh_check_thick_steps(
+            snapshot.arrays, snapshot.co_world, stk_tools_props.thickness_min,
+            chunk_size=2048)
+        cls.append_info(info, (faces_error,))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_helpers
+
+        scene = bpy.context.scene
+        stk_tools_props = scene.stk_tools_props
+
+        faces_error = mesh_helpers.mesh_check_thick(
+            snapshot.arrays, snapshot.co_world, stk_tools_props.thickness_min)
+        cls.append_info(info, (faces_error,))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -299,27 +416,32 @@ class MESH_OT_stk_tools_check_sharp(Operator):
     bl_idname = "mesh.stk_tools_check_sharp"
     bl_label = "3D-Print-STK Check Sharp"
     bl_description = "Check edges are below the sharpness preference"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "sharp"
+    # Scene properties the result depends on.
+    check_props = ("angle_sharp",)
+    attribute_names = ("stk_sharp",)
 
     @staticmethod
-    def main_check(obj, info):
-        from . import mesh_helpers
+    def append_info(info, results):
+        edges_sharp, = results
+
+        info.append((tip_("锐利边: {}").format(
+            len(edges_sharp)), ('EDGE', edges_sharp)))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
 
         scene = bpy.context.scene
         stk_tools_props = scene.stk_tools_props
         angle_sharp = stk_tools_props.angle_sharp
 
-        bm = mesh_helpers.bmesh_copy_from_object(
-            obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        edges_sharp = [
-            ele.index for ele in bm.edges
-            if ele.is_manifold and ele.calc_face_angle_signed() > angle_sharp
-        ]
-
-        info.append((tip_("锐利边: {}").format(
-            len(edges_sharp)), (bmesh.types.BMEdge, edges_sharp)))
-        bm.free()
+        edges_sharp = mesh_arrays.check_sharp(
+            snapshot.co_world, snapshot.arrays, snapshot.topology, angle_sharp)
+        cls.append_info(info, (edges_sharp,))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -329,36 +451,40 @@ class MESH_OT_stk_tools_check_overhang(Operator):
     bl_idname = "mesh.stk_tools_check_overhang"
     bl_label = "3D-Print-STK Check Overhang"
     bl_description = "Check faces don't overhang past a certain angle"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Key of the results in mesh_arrays.check_arrays().
+    check_name = "overhang"
+    # Scene properties the result depends on.
+    check_props = ("angle_overhang",)
+    attribute_names = ("stk_overhang",)
 
     @staticmethod
-    def main_check(obj, info):
-        from mathutils import Vector
-        from . import mesh_helpers
+    def append_info(info, results):
+        if results is None:
+            info.append(("跳过悬空", ()))
+            return
+
+        faces_overhang, = results
+
+        info.append((tip_("悬空面: {}").format(
+            len(faces_overhang)), ('FACE', faces_overhang)))
+
+    @classmethod
+    def main_check(cls, obj, info, snapshot):
+        from . import mesh_arrays
 
         scene = bpy.context.scene
         stk_tools_props = scene.stk_tools_props
         angle_overhang = (math.pi / 2.0) - stk_tools_props.angle_overhang
 
         if angle_overhang == math.pi:
-            info.append(("跳过悬空", ()))
+            cls.append_info(info, None)
             return
 
-        bm = mesh_helpers.bmesh_copy_from_object(
-            obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        z_down = Vector((0, 0, -1.0))
-        z_down_angle = z_down.angle
-
-        # 4.0 ignores zero area faces
-        faces_overhang = [
-            ele.index for ele in bm.faces
-            if z_down_angle(ele.normal, 4.0) < angle_overhang
-        ]
-
-        info.append((tip_("悬空面: {}").format(
-            len(faces_overhang)), (bmesh.types.BMFace, faces_overhang)))
-        bm.free()
+        faces_overhang = mesh_arrays.check_overhang(
+            snapshot.co_world, snapshot.arrays, angle_overhang)
+        cls.append_info(info, (faces_overhang,))
 
     def execute(self, context):
         return execute_check(self, context)
@@ -368,6 +494,10 @@ class MESH_OT_stk_tools_check_all(Operator):
     bl_idname = "mesh.stk_tools_check_all"
     bl_label = "3D-Print-STK Check All"
     bl_description = "Run all checks"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Seconds of work per timer event when running modal.
+    time_slice = 0.1
 
     check_cls = (
         MESH_OT_stk_tools_check_solid,
@@ -380,16 +510,157 @@ class MESH_OT_stk_tools_check_all(Operator):
     )
 
     def execute(self, context):
+        from . import mesh_helpers
+
         obj = context.active_object
+        stk_tools_props = context.scene.stk_tools_props
 
-        info = []
-        for cls in self.check_cls:
-            cls.main_check(obj, info)
+        snapshot = mesh_helpers.MeshSnapshot(obj)
+        try:
+            infos = list(iter_checks(obj, self.check_cls, stk_tools_props, snapshot=snapshot))
+            store_results(obj, self.check_cls, infos, stk_tools_props,
+                          fingerprint=snapshot.fingerprint)
+        finally:
+            snapshot.free()
 
-        report.update(*info)
+        multiple_obj_warning(self, context)
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        # Run the checks from a timer so the UI stays responsive,
+        # execute() is kept for scripts and background mode.
+        from . import mesh_helpers
+
+        self._obj = context.active_object
+        self._obj_name = self._obj.name
+        self._obj_mode = self._obj.mode
+        self._infos = []
+        self._done = 0
+        self._snapshot = mesh_helpers.MeshSnapshot(self._obj)
+        self._checks = iter_checks(
+            self._obj, self.check_cls, context.scene.stk_tools_props,
+            snapshot=self._snapshot, steps=True)
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self.check_cls))
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        self.update_status(context)
 
         multiple_obj_warning(self, context)
 
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        import time
+
+        # Events pass through, the object may be gone or in another mode by now.
+        obj = context.scene.objects.get(self._obj_name)
+        if obj is None or obj != self._obj or obj.mode != self._obj_mode:
+            self.finish(context, store=False)
+            self.report({'WARNING'}, "物体已删除或模式已改变, 已取消检查")
+            return {'CANCELLED'}
+
+        if event.type == 'ESC' and event.value == 'PRESS':
+            # Keep the results of the checks done so far,
+            # FINISHED when stored so writing the attributes can be undone.
+            ret = self.finish(context)
+            self.report({'WARNING'}, tip_("已取消检查, 完成 {}/{} 项").format(
+                self._done, len(self.check_cls)))
+            return ret
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        is_done = False
+        try:
+            time_end = time.perf_counter() + self.time_slice
+            for cls_info in self._checks:
+                if cls_info is not None:
+                    self._infos.append(cls_info)
+                    self._done += 1
+                if time.perf_counter() >= time_end:
+                    break
+            else:
+                is_done = True
+            if not is_done:
+                # Partial results show up as soon as each check is done.
+                report.update(
+                    self._obj, *(line for cls_info in self._infos for line in cls_info),
+                    fingerprint=self._snapshot.fingerprint)
+
+                context.window_manager.progress_update(self._done)
+                self.update_status(context)
+        except Exception:
+            # Remove the timer and free the snapshot whatever went wrong.
+            self.finish(context, store=False)
+            raise
+
+        if is_done:
+            return self.finish(context)
+        return {'RUNNING_MODAL'}
+
+    def update_status(self, context):
+        # The last check may be done with the generator not exhausted yet.
+        cls = self.check_cls[min(self._done, len(self.check_cls) - 1)]
+        context.workspace.status_text_set(tip_("检查中 {}/{}: {} (Esc 取消)").format(
+            min(self._done + 1, len(self.check_cls)), len(self.check_cls), cls.bl_label))
+        for area in context.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+    def finish(self, context, store=True):
+        from . import mesh_helpers
+
+        ret = {'CANCELLED'}
+        try:
+            self._checks.close()
+            if store:
+                # The mesh can be edited while the checks run.
+                if mesh_helpers.mesh_fingerprint(self._obj) != self._snapshot.fingerprint:
+                    self.report({'WARNING'}, "检查期间网格已修改, 结果已丢弃")
+                else:
+                    store_results(self._obj, self.check_cls, self._infos,
+                                  context.scene.stk_tools_props,
+                                  fingerprint=self._snapshot.fingerprint)
+                    ret = {'FINISHED'}
+        finally:
+            self._snapshot.free()
+
+            wm = context.window_manager
+            wm.event_timer_remove(self._timer)
+            wm.progress_end()
+            context.workspace.status_text_set(None)
+            for area in context.screen.areas:
+                if area.type == 'PROPERTIES':
+                    area.tag_redraw()
+        return ret
+
+
+class MESH_OT_stk_tools_check_batch(Operator):
+    bl_idname = "mesh.stk_tools_check_batch"
+    bl_label = "3D-Print-STK Check Batch"
+    bl_description = "Run all checks on every selected mesh, using several processes"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        from . import batch
+
+        objects = [
+            obj for obj in context.selected_objects if obj.type == 'MESH']
+        if not objects:
+            self.report({'WARNING'}, "没有选择网格物体")
+            return {'CANCELLED'}
+
+        rows = batch.check_objects(
+            objects,
+            MESH_OT_stk_tools_check_all.check_cls,
+            context.scene.stk_tools_props,
+        )
+        self.report({'INFO'}, tip_("已检查 {} 个物体, {} 个有问题").format(
+            len(rows), sum(1 for row in rows if row["issues"])))
+
         return {'FINISHED'}
 
 
@@ -409,13 +680,16 @@ class MESH_OT_stk_tools_clean_distorted(Operator):
     )
 
     def execute(self, context):
-        from . import mesh_helpers
+        from . import mesh_helpers, mesh_arrays
 
         obj = context.active_object
+        arrays = mesh_helpers.mesh_arrays_from_object(obj)
+        faces_distort = mesh_arrays.check_distorted(
+            arrays.co, arrays, self.angle)
+
         bm = mesh_helpers.bmesh_from_object(obj)
-        bm.normal_update()
-        elems_triangulate = [
-            ele for ele in bm.faces if mesh_helpers.face_is_distorted(ele, self.angle)]
+        bm.faces.ensure_lookup_table()
+        elems_triangulate = [bm.faces[i] for i in faces_distort]
 
         if elems_triangulate:
             bmesh.ops.triangulate(bm, faces=elems_triangulate)
@@ -564,12 +838,13 @@ class MESH_OT_stk_tools_clean_non_manifold(Operator):
 
     @classmethod
     def count_non_manifold_verts(cls, context):
-        """return a set of coordinates of non-manifold vertices"""
-        cls.select_non_manifold_verts(
-            use_wire=True, use_boundary=True, use_verts=True)
+        """return the number of non-manifold vertices"""
+        from . import mesh_helpers, mesh_arrays
 
-        bm = bmesh.from_edit_mesh(context.edit_object.data)
-        return sum((1 for v in bm.verts if v.select))
+        arrays = mesh_helpers.mesh_arrays_from_object(context.edit_object)
+        topology = mesh_arrays.TopologyIndex(arrays)
+        return int(topology.verts_non_manifold(
+            use_wire=True, use_boundary=True, use_verts=True).sum())
 
     @classmethod
     def fill_non_manifold(cls, sides):
@@ -608,38 +883,36 @@ class MESH_OT_stk_tools_select_report(Operator):
 
     index: IntProperty()
 
-    _type_to_mode = {
-        bmesh.types.BMVert: 'VERT',
-        bmesh.types.BMEdge: 'EDGE',
-        bmesh.types.BMFace: 'FACE',
-    }
-
-    _type_to_attr = {
-        bmesh.types.BMVert: "verts",
-        bmesh.types.BMEdge: "edges",
-        bmesh.types.BMFace: "faces",
-    }
+    @classmethod
+    def poll(cls, context):
+        obj = context.edit_object
+        return obj is not None and obj.type == 'MESH'
 
     def execute(self, context):
         obj = context.edit_object
-        info = report.info()
-        _text, data = info[self.index]
-        bm_type, bm_array = data
-
-        bpy.ops.mesh.reveal()
-        bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.mesh.select_mode(type=self._type_to_mode[bm_type])
+        rep = report.get(obj)
+        if rep is None or self.index >= len(rep.entries):
+            return {'CANCELLED'}
 
-        bm = bmesh.from_edit_mesh(obj.data)
-        elems = getattr(
-            bm, MESH_OT_stk_tools_select_report._type_to_attr[bm_type])[:]
+        entry = rep.entries[self.index]
+        # Info lines (volume, area, ...) have nothing to select.
+        if entry.elem_type is None or not len(entry):
+            return {'CANCELLED'}
 
-        try:
-            for i in bm_array:
-                elems[i].select_set(True)
-        except:
-            # possible arrays are out of sync
+        if report.is_stale(obj, rep):
             self.report({'WARNING'}, "报告已过期，重新进行检查")
+            return {'CANCELLED'}
+
+        from . import mesh_helpers
+
+        # Write the selection to the mesh data in one go with NumPy masks,
+        # entering edit mode again flushes it to the edit-mesh.
+        bpy.ops.object.mode_set(mode='OBJECT')
+        mesh_helpers.mesh_select_elements(
+            obj.data, entry.elem_type, entry.indices)
+        context.tool_settings.mesh_select_mode = tuple(
+            elem_type == entry.elem_type for elem_type in ('VERT', 'EDGE', 'FACE'))
+        bpy.ops.object.mode_set(mode='EDIT')
 
         return {'FINISHED'}
 
@@ -682,13 +955,12 @@ class MESH_OT_stk_tools_scale_to_volume(Operator):
 
     def invoke(self, context, event):
 
-        def calc_volume(obj):
-            from . import mesh_helpers
+        from . import mesh_helpers
 
-            bm = mesh_helpers.bmesh_copy_from_object(obj, apply_modifiers=True)
-            volume = bm.calc_volume(signed=True)
-            bm.free()
-            return volume
+        depsgraph = context.evaluated_depsgraph_get()
+
+        def calc_volume(obj):
+            return mesh_helpers.mesh_mass_properties(obj, depsgraph).volume
 
         if context.mode == 'EDIT_MESH':
             volume = calc_volume(context.edit_object)
@@ -733,24 +1005,23 @@ class MESH_OT_stk_tools_scale_to_bounds(Operator):
         return {'FINISHED'}
 
     def invoke(self, context, event):
-        from mathutils import Vector
-
-        def calc_length(vecs):
-            return max(((max(v[i] for v in vecs) - min(v[i] for v in vecs)), i) for i in range(3))
+        import numpy as np
+        from . import bounds
 
         if context.mode == 'EDIT_MESH':
-            length, axis = calc_length(
-                [Vector(v) @ obj.matrix_world for obj in [context.edit_object]
-                 for v in obj.bound_box]
-            )
+            objects = [context.edit_object]
         else:
-            length, axis = calc_length(
-                [
-                    Vector(v) @ obj.matrix_world for obj in context.selected_editable_objects
-                    if obj.type == 'MESH'
-                    for v in obj.bound_box
-                ]
-            )
+            objects = [
+                obj for obj in context.selected_editable_objects
+                if obj.type == 'MESH'
+            ]
+
+        length = 0.0
+        if objects:
+            boxes = bounds.world_bounds(objects)
+            size = boxes[:, 1].max(axis=0) - boxes[:, 0].min(axis=0)
+            axis = int(np.argmax(size))
+            length = float(size[axis])
 
         if length == 0.0:
             self.report({'WARNING'}, "物体的边为0")
@@ -907,10 +1178,12 @@ class OBJECT_OT_reset_origin_and_move_to_zero(bpy.types.Operator):
             utils.show_message_box("未选择任何对象，请先选择对象")
             return {'FINISHED'}
         else:
+            from . import mesh_helpers
+
+            if context.mode != 'OBJECT':
+                bpy.ops.object.mode_set(mode='OBJECT')
+            mesh_helpers.objects_origin_set(context.selected_objects, center='BOUNDS')
             for obj in context.selected_objects:
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.origin_set(
-                    type='ORIGIN_GEOMETRY', center='BOUNDS')
                 obj.location = (0, 0, 0)
             return {'FINISHED'}
 
@@ -918,98 +1191,226 @@ class OBJECT_OT_reset_origin_and_move_to_zero(bpy.types.Operator):
 class ThinningObject(bpy.types.Operator):
     bl_idname = "object.thinning_object"
     bl_label = "改变厚度"
+    bl_description = "Move the surface of the selected objects along its normals"
+    bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
+        from . import mesh_helpers
+
         selected_objects = context.selected_objects
         if len(selected_objects) == 0:
             utils.show_message_box("没有选择任何对象")
             return {'FINISHED'}
-        else:
-            for obj in selected_objects:
-                thinning_float = context.scene.stk_tools_props.thinning_float
-                self.report({'INFO'}, "减薄/增厚量: " + str(thinning_float))
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.select_all(action='SELECT')
-                bpy.ops.mesh.select_mode(type="FACE")
-                bpy.ops.transform.shrink_fatten(
-                    value=thinning_float,
-                    use_even_offset=False,
-                    mirror=True,
-                    use_proportional_edit=True,
-                    proportional_edit_falloff='SMOOTH',
-                    proportional_size=0.909091,
-                    use_proportional_connected=False,
-                    use_proportional_projected=False,
-                    snap=False,
-                    release_confirm=True
-                )
-                bpy.ops.object.mode_set(mode='OBJECT')
+
+        stk_tools_props = context.scene.stk_tools_props
+        thinning_float = stk_tools_props.thinning_float
+        self.report({'INFO'}, "减薄/增厚量: " + str(thinning_float))
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        mesh_helpers.mesh_offset_shell(
+            selected_objects, thinning_float,
+            use_even_offset=stk_tools_props.thinning_even_offset)
         return {'FINISHED'}
 
 
 class CreateObjectsProjectionToZZero(bpy.types.Operator):
     bl_idname = "object.create_object_projection"
     bl_label = "创建投影（Z=0）"
+    bl_description = "Create the outline of the selected objects seen from above at Z=0"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    resolution: IntProperty(
+        name="分辨率",
+        description=(
+            "Grid cells across the larger side of the outline. The outline is "
+            "approximated on this grid: it lies up to one cell (larger side / resolution) "
+            "outside the true silhouette, plus up to one cell of simplification"
+        ),
+        default=1024,
+        min=16,
+        max=8192,
+    )
 
     def execute(self, context):
-        selected_objects = context.selected_objects
+        import numpy as np
+        from . import (
+            mesh_helpers,
+            silhouette,
+        )
+
+        selected_objects = [
+            obj for obj in context.selected_objects if obj.type == 'MESH']
         if len(selected_objects) == 0:
             utils.show_message_box("没有选择任何对象")
             return {'FINISHED'}
-        else:
-            for obj in selected_objects:
-                bpy.context.view_layer.objects.active = obj
-                mesh_data = bpy.data.meshes.new("projection")
-                projection_object = bpy.data.objects.new(
-                    "projection", mesh_data)
-                scene = bpy.context.scene
-                scene.collection.objects.link(projection_object)
-                bm = bmesh.new()
-                bm.from_mesh(obj.data)
-                bm.transform(obj.matrix_world)
-                matrix_proj = Matrix()
-                matrix_proj[0][0] = 1
-                matrix_proj[1][1] = 1
-                matrix_proj[2][2] = 0
-                for v in bm.verts:
-                    v.co = matrix_proj @ v.co
-                bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
-                bm.to_mesh(mesh_data)
-                bm.free()
+
+        depsgraph = context.evaluated_depsgraph_get()
+        for obj in selected_objects:
+            co, tri_verts = mesh_helpers.mesh_triangles_evaluated(obj, depsgraph)
+            if not len(tri_verts):
+                continue
+
+            xy_min = co[:, :2].min(axis=0)
+            xy_max = co[:, :2].max(axis=0)
+            cell_size = float((xy_max - xy_min).max()) / self.resolution
+            if cell_size <= 0.0:
+                continue
+            nx, ny = (np.ceil((xy_max - xy_min) / cell_size).astype(int) + 1).tolist()
+            # Center the grid on the object.
+            x_min, y_min = (xy_min + xy_max - np.array((nx, ny)) * cell_size) / 2.0
+
+            covered = silhouette.rasterize(co, tri_verts, x_min, y_min, cell_size, nx, ny)
+            points, edges = silhouette.outline(covered)
+
+            # Closed loops with the staircases simplified away (tolerance of one cell).
+            loops_co = []
+            for loop in silhouette.loops(edges):
+                loop_co = points[loop].astype(np.float64)
+                loops_co.append(loop_co[silhouette.simplify(loop_co, 1.0)])
+            if not loops_co:
+                continue
+            loop_sizes = np.array([len(loop_co) for loop_co in loops_co])
+            loop_starts = np.cumsum(loop_sizes) - loop_sizes
+            points = np.concatenate(loops_co)
+            # Every point connects to the next one of its loop.
+            edges = np.arange(len(points))
+            edges = np.stack((edges, edges + 1), axis=1)
+            edges[loop_starts + loop_sizes - 1, 1] = loop_starts
+
+            verts_co = np.zeros((len(points), 3), dtype=np.float32)
+            verts_co[:, 0] = x_min + points[:, 0] * cell_size
+            verts_co[:, 1] = y_min + points[:, 1] * cell_size
+
+            mesh_data = bpy.data.meshes.new("projection")
+            mesh_data.vertices.add(len(verts_co))
+            mesh_data.vertices.foreach_set("co", verts_co.ravel())
+            mesh_data.edges.add(len(edges))
+            mesh_data.edges.foreach_set("vertices", edges.astype(np.int32).ravel())
+            mesh_data.update()
+
+            projection_object = bpy.data.objects.new("projection", mesh_data)
+            context.scene.collection.objects.link(projection_object)
+
+        return {'FINISHED'}
 
 
 class OBJECT_PT_SantoukaBusinessMeshBottom(bpy.types.Operator):
     bl_idname = "objects.santouka_business_mesh_bottom"
     bl_label = "创建底部"
     bl_description = "Create bottom mesh for vacuum forming"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # initialized from the scene properties, adjustable from the redo panel
+    thickness: FloatProperty(
+        name="壁厚(mm)",
+        default=1.5,
+    )
+    remesh_size: FloatProperty(
+        name="结构最小单元",
+        default=0.3,
+        min=0.001,
+    )
+    final_remesh: BoolProperty(
+        name="最终重构网格",
+        default=False,
+    )
+    # set by invoke (kept on redo), script calls leave the scene properties alone
+    sync_scene: BoolProperty(
+        options={'HIDDEN', 'SKIP_SAVE'},
+    )
+
+    def invoke(self, context, event):
+        stk_tools_props = context.scene.stk_tools_props
+        self.thickness = stk_tools_props.bottom_thinning_float
+        self.remesh_size = stk_tools_props.bottom_remesh_float
+        self.final_remesh = stk_tools_props.bottom_final_remesh
+        self.sync_scene = True
+        return self.execute(context)
+
+    def remesh_voxel_size(self, stk_tools_props, final_object, shell_key, shell, voxel_size):
+        """
+        Check the final remesh against the budget and the wall thickness
+        before running it, returns the voxel size to use or None to skip it.
+        """
+        import numpy as np
+        from . import heightmap, mesh_arrays, mesh_helpers
+
+        shell_co, shell_faces = shell
+        area = float(mesh_arrays.polygon_areas(
+            shell_co, shell_faces.ravel(),
+            np.arange(0, shell_faces.size, 4), np.full(len(shell_faces), 4)).sum())
+        dimensions = tuple((shell_co.max(axis=0) - shell_co.min(axis=0)).tolist())
+        memory_max = stk_tools_props.remesh_memory_budget * 2 ** 20
+        faces_max = stk_tools_props.remesh_faces_budget
+        adjust = stk_tools_props.remesh_budget_mode == 'ADJUST'
+
+        estimate = modifiers.remesh_estimate(dimensions, voxel_size, area)
+        if estimate.over_budget(memory_max, faces_max) > 1.0:
+            if not adjust:
+                self.report({'WARNING'}, tip_("重构网格超出预算 ({} 面, {} MB), 已跳过").format(
+                    estimate.faces, round(estimate.memory / 2 ** 20)))
+                return None
+            voxel_size = modifiers.remesh_fit_budget(estimate, memory_max, faces_max)
+            self.report({'INFO'}, tip_("重构网格超出预算, 体素大小调整为 {}").format(
+                round(voxel_size, 4)))
+
+        # holes open where a wall is less than two voxels thick
+        wall_min = heightmap.stage_get("wall", shell_key)
+        if wall_min is None:
+            snapshot = mesh_helpers.MeshSnapshot(final_object)
+            try:
+                thickness = mesh_helpers.mesh_thickness_samples(
+                    snapshot.arrays, snapshot.co_world)
+            finally:
+                snapshot.free()
+            thickness = thickness[np.isfinite(thickness)]
+            wall_min = heightmap.stage_put(
+                "wall", shell_key, float(np.percentile(thickness, 5)) if len(thickness) else 0.0)
+
+        if wall_min > 0.0 and voxel_size > wall_min / 2.0:
+            voxel_size_safe = wall_min / 2.0
+            if not adjust:
+                self.report({'WARNING'}, tip_("体素大小 {} 大于最薄处 {} 的一半, 可能出现破洞, 已跳过重构网格").format(
+                    round(voxel_size, 4), round(wall_min, 4)))
+                return None
+            if modifiers.remesh_estimate(
+                    dimensions, voxel_size_safe, area).over_budget(memory_max, faces_max) <= 1.0:
+                voxel_size = voxel_size_safe
+                self.report({'INFO'}, tip_("体素大小调整为 {}, 以免出现破洞").format(
+                    round(voxel_size, 4)))
+            else:
+                # the budget doesn't allow a voxel size without holes
+                self.report({'WARNING'}, tip_("预算内的体素大小 {} 会在最薄处 {} 出现破洞, 已跳过重构网格").format(
+                    round(voxel_size, 4), round(wall_min, 4)))
+                return None
+
+        return voxel_size
 
     def execute(self, context):
-        # TODO: Add params check and error message
-        #   befor the business logic
+        import zlib
+        from . import heightmap, mesh_helpers
 
-        # get method from dependencies
-        get_bounds = utils.get_bounds
-        create_tmp_plane = utils.create_tmp_plane
-        scale_object = utils.scale_object_110_non_standard
-        clean_after_shrinkwraped = utils.clean_useless_verts_and_faces_after_shrinkwraped
+        stk_tools_props = context.scene.stk_tools_props
+        depsgraph = context.evaluated_depsgraph_get()
 
-        # get method for modifiers
-        remesh_direct = modifiers.remesh_direct
-        solidify_direct = modifiers.solidify_direct
-        shrinkwrap_project_direct = modifiers.shrinkwrap_project_direct
+        # remember the settings adjusted in the redo panel for the panel
+        if self.sync_scene:
+            stk_tools_props.bottom_thinning_float = self.thickness
+            stk_tools_props.bottom_remesh_float = self.remesh_size
+            stk_tools_props.bottom_final_remesh = self.final_remesh
 
         # business logic
         # selected_objects will same as "target_objects"
-        selected_objects = context.selected_objects
+        selected_objects = [
+            obj for obj in context.selected_objects if obj.type == 'MESH']
 
         for selected_object in selected_objects:
 
-            # get bounds of selected_object
-            # for caculation plane size & postion for deploy
-            selected_object_bounds = get_bounds(selected_object)
+            # stage: bounds (cached by bounds.py)
+            # for caculation grid size & postion
+            selected_object_bounds = utils.get_bounds(selected_object)
 
-            # create plane by selected_object_bounds
             tmp_plane_x = selected_object_bounds[1] - selected_object_bounds[0]
             tmp_plane_y = selected_object_bounds[3] - selected_object_bounds[2]
             tmp_plane_top_z = selected_object_bounds[5]
@@ -1019,83 +1420,90 @@ class OBJECT_PT_SantoukaBusinessMeshBottom(bpy.types.Operator):
                 utils.show_message_box("所选择对象过小，无法创建底部")
                 return {'FINISHED'}
 
-            try:
-                # get thickness from scene props
-                real_world_solidify_thickness = context.scene.stk_tools_props.bottom_thinning_float
-                # get remesh size from scene props
-                bottom_remesh_size = context.scene.stk_tools_props.bottom_remesh_float
-
-                if bottom_remesh_size > real_world_solidify_thickness:
-                    utils.show_message_box("底部mesh的内部支撑不能大于厚度")
-                    return {'FINISHED'}
-
-                # create tmp_plane and scale to selected_object size
-                # tmp_plane_not_scaled: tmp_plane without scale
-                # tmp_plane: tmp_plane after scale
-                # scale / resize plane to selected_object size
-                # will use tmp_plane for remesh & shrinkwrap
-                # plane need enough vertices & faces for shrinkwrap
-
-                tmp_plane_not_scaled = create_tmp_plane(bpy)
-                tmp_plane_object = scale_object(bpy, tmp_plane_not_scaled, {
-                    'x': tmp_plane_x,
-                    'y': tmp_plane_y,
-                })
-
-                # move plane_object to top of selected_object
-                tmp_plane_object.location.z = tmp_plane_top_z + 5
-
-                # remesh: tmp_plane -> tmp_plane_remeshed
-                # for next shrinkwrap need more vertices & faces
-                tmp_plane_object_remeshed = remesh_direct(
-                    bpy,
-                    tmp_plane_object,
-                    'VOXEL',
-                    bottom_remesh_size
-                )
-
-                # shrinkwrap: tmp_plane_remeshed -> selected_object
-                # made tmp_plane_remeshed fit selected_object(target_object)
-                # TODO: shrinkwrap need more options for user panel
-                tmp_plane_shrinkwraped_tuple = shrinkwrap_project_direct(
-                    bpy, tmp_plane_object_remeshed, selected_object, )
-                tmp_bottom_mesh = tmp_plane_shrinkwraped_tuple[0]
-                # now tmp_bottom_mesh project on to the selected_object
-                # move tmp_bottom_mesh mesh useless vertices to z = 0, and clean
-                # useless vertices: the part of
-                #   not shrinkwrap project on the selected_object part
-                stash_tmp_bottom_object = clean_after_shrinkwraped(
-                    bpy, tmp_bottom_mesh, tmp_plane_top_z)
-                # this stash_bottom_object not solidify yet
-
-                # solidify: add solid stash_tmp_bottom_object
-                # thickness = real_world_solidify_thickness / 2
-                # as default unit "m" in blender
-                judge_thickness: bool = (
-                    isinstance(real_world_solidify_thickness, float)
-                    and
-                    real_world_solidify_thickness > 0.05
-                )
-                solidify_thickness_float = (0.7, real_world_solidify_thickness)[
-                    judge_thickness]
-
-                self.report({'INFO'}, "solidify_thickness_float: " +
-                            str(solidify_thickness_float))
-                solidified_object = solidify_direct(
-                    bpy, stash_tmp_bottom_object, solidify_thickness_float)
-                # cuz it maybe have the bad faces, so need remesh again
-
-                # remesh: solidified_object -> final_object
-                final_object = remesh_direct(
-                    bpy, solidified_object, 'VOXEL', bottom_remesh_size)
-
-                # feat: issue-10
-                # reseted_final_object = utils.reset_object_origin(bpy, final_object)
-                utils.reset_object_origin(bpy, final_object)
-
-            except Exception as e:
-                raise Exception(e)
-                self.report({'ERROR'}, "底部 mesh 添加失败")
+            real_world_solidify_thickness = self.thickness
+            # remesh size is the grid cell size
+            bottom_remesh_size = self.remesh_size
+
+            if bottom_remesh_size > real_world_solidify_thickness:
+                utils.show_message_box("底部mesh的内部支撑不能大于厚度")
+                return {'FINISHED'}
+
+            # grid covers the object with 5% margin on each side
+            nx = math.ceil(tmp_plane_x * 1.1 / bottom_remesh_size) + 1
+            ny = math.ceil(tmp_plane_y * 1.1 / bottom_remesh_size) + 1
+            if nx * ny > heightmap.NODES_MAX:
+                utils.show_message_box("结构最小单元过小，网格过大")
                 return {'FINISHED'}
 
+            # thickness = real_world_solidify_thickness
+            # as default unit "m" in blender
+            judge_thickness: bool = (
+                isinstance(real_world_solidify_thickness, float)
+                and
+                real_world_solidify_thickness > 0.05
+            )
+            solidify_thickness_float = (0.7, real_world_solidify_thickness)[
+                judge_thickness]
+
+            co, tri_verts = mesh_helpers.mesh_triangles_evaluated(
+                selected_object, depsgraph)
+            surface_key = (
+                selected_object.name,
+                zlib.crc32(co.tobytes()),
+                zlib.crc32(tri_verts.tobytes()),
+                bottom_remesh_size,
+            )
+
+            # stage: surface, cast rays down onto the (evaluated) target
+            surface = heightmap.stage_get("surface", surface_key)
+            if surface is None:
+                x_center = (selected_object_bounds[0] + selected_object_bounds[1]) / 2
+                y_center = (selected_object_bounds[2] + selected_object_bounds[3]) / 2
+                surface = heightmap.stage_put("surface", surface_key, heightmap.heightmap(
+                    co, tri_verts,
+                    x_center - (nx - 1) * bottom_remesh_size / 2,
+                    y_center - (ny - 1) * bottom_remesh_size / 2,
+                    nx, ny, bottom_remesh_size,
+                    tmp_plane_top_z + 5,
+                ))
+
+            # stage: shell, the cells hit, solidified and closed by side walls
+            shell_key = surface_key + (solidify_thickness_float,)
+            shell = heightmap.stage_get("shell", shell_key)
+            if shell is None:
+                shell = heightmap.stage_put("shell", shell_key, heightmap.shell(
+                    *surface, solidify_thickness_float))
+            shell_co, shell_faces = shell
+            if not len(shell_faces):
+                self.report({'ERROR'}, "底部 mesh 添加失败")
+                continue
+
+            name = selected_object.name + "_bottom"
+            final_object = bpy.data.objects.new(
+                name, mesh_helpers.mesh_from_quads(name, shell_co, shell_faces))
+            context.collection.objects.link(final_object)
+
+            # stage: final remesh, checked against the budget first
+            if self.final_remesh:
+                voxel_size = self.remesh_voxel_size(
+                    stk_tools_props, final_object, shell_key, shell,
+                    bottom_remesh_size)
+                if voxel_size is not None:
+                    remesh_key = shell_key + (voxel_size,)
+                    remeshed = heightmap.stage_get("remesh", remesh_key)
+                    if remeshed is None:
+                        modifiers.remesh_direct(
+                            bpy, final_object, 'VOXEL', voxel_size)
+                        heightmap.stage_put(
+                            "remesh", remesh_key,
+                            mesh_helpers.mesh_polygon_arrays(final_object.data))
+                    else:
+                        shell_mesh = final_object.data
+                        final_object.data = mesh_helpers.mesh_from_polygons(
+                            name, *remeshed)
+                        bpy.data.meshes.remove(shell_mesh)
+
+            # feat: issue-10
+            utils.reset_object_origin(bpy, final_object)
+
         return {'FINISHED'}
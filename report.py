@@ -1,14 +1,126 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 # Report errors with the mesh.
+#
+# Reports are kept per object and tagged with the fingerprint of the mesh
+# they were made from, so stale ones are known before their indices are used.
+# Least recently used reports are dropped past the memory budget.
 
 
-_data = []
+import time
+from collections import OrderedDict
 
+import numpy as np
 
-def update(*args):
-    _data[:] = args
+BUDGET_BYTES = 64 * 1024 * 1024
 
 
-def info():
-    return tuple(_data)
+class Entry:
+    """One line of a report and the elements it is about."""
+
+    __slots__ = ("text", "elem_type", "indices")
+
+    def __init__(self, text, elem_type=None, indices=None):
+        self.text = text
+        # 'VERT', 'EDGE', 'FACE' or None for text only lines.
+        self.elem_type = elem_type
+        # Read-only int array, shared with the check cache.
+        self.indices = indices
+
+    def __len__(self):
+        return 0 if self.indices is None else len(self.indices)
+
+
+class Report:
+    """Report of the last check run on one object."""
+
+    __slots__ = ("name", "fingerprint", "time", "entries", "nbytes")
+
+    def __init__(self, name, fingerprint, entries):
+        self.name = name
+        self.fingerprint = fingerprint
+        self.time = time.time()
+        self.entries = entries
+        self.nbytes = sum(
+            entry.indices.nbytes for entry in entries if entry.indices is not None)
+
+
+# object name -> Report, least recently used first
+_data = OrderedDict()
+_size = 0
+
+
+def _entry(text, data):
+    if not data:
+        return Entry(text)
+    elem_type, indices = data
+    indices = np.asarray(indices, dtype=np.intc)
+    indices.flags.writeable = False
+    return Entry(text, elem_type, indices)
+
+
+def update(obj, *args, fingerprint=None):
+    """
+    Replace the report of an object with ``(text, (elem_type, indices) or None)`` lines.
+
+    ``fingerprint`` is the mesh_helpers.mesh_fingerprint() the results were made from.
+    """
+    global _size
+
+    if fingerprint is None:
+        from .mesh_helpers import mesh_fingerprint
+        fingerprint = mesh_fingerprint(obj)
+
+    if obj.name in _data:
+        _size -= _data.pop(obj.name).nbytes
+
+    rep = Report(obj.name, fingerprint, tuple(_entry(*arg) for arg in args))
+    _data[obj.name] = rep
+    _size += rep.nbytes
+
+    while _size > BUDGET_BYTES and len(_data) > 1:
+        _name, rep_old = _data.popitem(last=False)
+        _size -= rep_old.nbytes
+
+
+def get(obj):
+    """Return the Report of an object or None."""
+    if obj is None:
+        return None
+    rep = _data.get(obj.name)
+    if rep is not None:
+        _data.move_to_end(obj.name)
+    return rep
+
+
+def info(obj):
+    rep = get(obj)
+    if rep is None:
+        return ()
+    return rep.entries
+
+
+def is_stale(obj, rep):
+    """True when the mesh changed since the report was made."""
+    from .mesh_helpers import mesh_fingerprint
+    return mesh_fingerprint(obj) != rep.fingerprint
+
+
+# summary rows of the last batch check, see batch.check_objects()
+_batch = []
+
+
+def batch_update(rows):
+    _batch[:] = rows
+
+
+def batch_info():
+    return tuple(_batch)
+
+
+def clear():
+    global _size
+
+    _data.clear()
+    _size = 0
+    _batch.clear()
@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Outline of a mesh seen from above (projected to the XY plane).
+#
+# Projected triangles are rasterized conservatively on a grid (a cell is
+# covered when any triangle overlaps it), so the covered cells are the union
+# of all triangles, holes included, grown by up to one cell. The outline are
+# the cell sides between covered and uncovered cells, merged into straight
+# runs, chained into closed loops and simplified within a tolerance so the
+# staircases of slanted edges become straight segments again.
+#
+# Pure NumPy, the output scales with the outline shape, not the face count
+# or the grid resolution.
+
+
+import numpy as np
+
+# (triangle, cell) pairs tested at once.
+CHUNK_SIZE = 1 << 22
+
+
+def rasterize(co, tri_verts, x_min, y_min, cell_size, nx, ny):
+    """
+    Return a (ny, nx) bool array of the grid cells overlapped by the
+    XY projection of the triangles.
+    """
+    covered = np.zeros((ny, nx), dtype=bool)
+    if not len(tri_verts):
+        return covered
+
+    tri_co = co[tri_verts][:, :, :2]
+    tri_min = tri_co.min(axis=1)
+    tri_max = tri_co.max(axis=1)
+    # Cells the bounds overlap, not the ones they only touch.
+    i_min = np.floor((tri_min[:, 0] - x_min) / cell_size).astype(np.int64)
+    i_max = np.maximum(np.ceil((tri_max[:, 0] - x_min) / cell_size).astype(np.int64) - 1, i_min)
+    j_min = np.floor((tri_min[:, 1] - y_min) / cell_size).astype(np.int64)
+    j_max = np.maximum(np.ceil((tri_max[:, 1] - y_min) / cell_size).astype(np.int64) - 1, j_min)
+    i_min, i_max = np.clip(i_min, 0, nx - 1), np.clip(i_max, 0, nx - 1)
+    j_min, j_max = np.clip(j_min, 0, ny - 1), np.clip(j_max, 0, ny - 1)
+
+    # Separating axes besides X and Y (handled by the cell ranges): the edge normals.
+    edge_vec = np.roll(tri_co, -1, axis=1) - tri_co
+    normals = np.stack((-edge_vec[:, :, 1], edge_vec[:, :, 0]), axis=2)
+    tri_proj = np.einsum("tkc,tvc->tkv", normals, tri_co)
+    proj_min = tri_proj.min(axis=2)
+    proj_max = tri_proj.max(axis=2)
+    # Projected half size of a cell on each normal.
+    radius = np.abs(normals).sum(axis=2) * (cell_size / 2.0)
+
+    width = i_max - i_min + 1
+    counts = width * (j_max - j_min + 1)
+    ends = np.cumsum(counts)
+
+    # Walk all (triangle, cell in its bounds) pairs in chunks,
+    # large triangles are split over several chunks.
+    for start in range(0, int(ends[-1]), CHUNK_SIZE):
+        pair = np.arange(start, min(start + CHUNK_SIZE, int(ends[-1])))
+        tri = np.searchsorted(ends, pair, side='right')
+        local = pair - (ends[tri] - counts[tri])
+        i = i_min[tri] + local % width[tri]
+        j = j_min[tri] + local // width[tri]
+
+        center = np.stack((
+            x_min + (i + 0.5) * cell_size,
+            y_min + (j + 0.5) * cell_size,
+        ), axis=1)
+        center_proj = np.einsum("pkc,pc->pk", normals[tri], center)
+        hit = (
+            (center_proj + radius[tri] > proj_min[tri]) &
+            (center_proj - radius[tri] < proj_max[tri]) |
+            # Zero length edges (collapsed triangles) don't separate anything.
+            (radius[tri] == 0.0)
+        ).all(axis=1)
+        covered[j[hit], i[hit]] = True
+
+    return covered
+
+
+def _runs(sides):
+    """
+    Merge the non-zero values of each row of ``sides`` into runs of equal values.
+
+    Returns (row, first, last + 1) arrays of the runs.
+    """
+    rows, cols = sides.shape
+    padded = np.zeros((rows, cols + 2), dtype=sides.dtype)
+    padded[:, 1:-1] = sides
+    change = padded[:, 1:] != padded[:, :-1]
+    row, col = np.nonzero(change)
+    # Every change ends the run before it and starts the next one.
+    value_after = padded[row, col + 1]
+    value_before = padded[row, col]
+
+    starts = value_after != 0
+    ends = value_before != 0
+    # Both lists are ordered by row then column, so they pair up.
+    return row[starts], col[starts], col[ends], value_after[starts]
+
+
+def outline(covered):
+    """
+    Return the outline of the covered cells as (points, edges).
+
+    points are (n, 2) integer grid corner coordinates (x, y),
+    edges are (m, 2) indices into points, one per straight run, directed
+    so the covered cells are on their left (outer loops counter-clockwise).
+    """
+    ny, nx = covered.shape
+    padded = np.zeros((ny + 2, nx + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = covered
+
+    # Horizontal sides at y, between cell rows y - 1 and y,
+    # +1 when the covered cell is above (the run goes along +X).
+    horizontal = padded[1:, 1:-1] - padded[:-1, 1:-1]
+    h_y, h_x0, h_x1, h_value = _runs(horizontal)
+    # Vertical sides at x, between cell columns x - 1 and x,
+    # +1 when the covered cell is on the right (the run goes along -Y).
+    vertical = (padded[1:-1, 1:] - padded[1:-1, :-1]).T
+    v_x, v_y0, v_y1, v_value = _runs(vertical)
+
+    h_forward = h_value > 0
+    v_forward = v_value < 0
+    segments = np.concatenate((
+        np.where(h_forward[:, None],
+                 np.stack((h_x0, h_y, h_x1, h_y), axis=1),
+                 np.stack((h_x1, h_y, h_x0, h_y), axis=1)),
+        np.where(v_forward[:, None],
+                 np.stack((v_x, v_y0, v_x, v_y1), axis=1),
+                 np.stack((v_x, v_y1, v_x, v_y0), axis=1)),
+    )).reshape(-1, 2)
+    keys, edges = np.unique(segments[:, 0] * (ny + 1) + segments[:, 1], return_inverse=True)
+    points = np.stack((keys // (ny + 1), keys % (ny + 1)), axis=1)
+    return points, edges.reshape(-1, 2)
+
+
+def loops(edges):
+    """
+    Chain directed outline edges into closed loops, returns a list of
+    point index arrays. Where two loops touch at a corner they are kept apart.
+    """
+    if not len(edges):
+        return []
+
+    # Every point has as many edges in as out, pair them in order.
+    edges_in = np.argsort(edges[:, 1], kind="stable")
+    edges_out = np.argsort(edges[:, 0], kind="stable")
+    edge_next = np.empty(len(edges), dtype=np.int64)
+    edge_next[edges_in] = edges_out
+
+    ret = []
+    visited = np.zeros(len(edges), dtype=bool)
+    edge_next = edge_next.tolist()
+    for start in range(len(edges)):
+        if visited[start]:
+            continue
+        loop = []
+        edge = start
+        while not visited[edge]:
+            visited[edge] = True
+            loop.append(edge)
+            edge = edge_next[edge]
+        ret.append(edges[loop, 0])
+    return ret
+
+
+def simplify(co, tolerance):
+    """
+    Douglas-Peucker simplification of a closed loop of (n, 2) points,
+    returns the indices of the points kept (at least 3 when there are).
+    """
+    num = len(co)
+    # Rectangles (the most common islands) don't get any simpler.
+    if num <= 4:
+        return np.arange(num)
+
+    closed = np.concatenate((co, co[:1]))
+    far = int(np.argmax(np.einsum("ij,ij->i", co - co[0], co - co[0])))
+    keep = np.zeros(num + 1, dtype=bool)
+    keep[[0, far, num]] = True
+
+    stack = [(0, far), (far, num)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = closed[b] - closed[a]
+        rel = closed[a + 1:b] - closed[a]
+        length = np.hypot(*seg)
+        if length == 0.0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = a + 1 + i
+            keep[mid] = True
+            stack.append((a, mid))
+            stack.append((mid, b))
+
+    kept = np.flatnonzero(keep[:num])
+    return kept if len(kept) >= 3 else np.arange(num)
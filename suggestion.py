@@ -0,0 +1,194 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# Remesh size suggestion for the bottom mesh.
+#
+# The depsgraph handler only notes that the target object (the last
+# selected one) or its mesh changed. The analysis starts from a timer once
+# nothing changed for DELAY seconds and runs in steps of about TIME_SLICE
+# seconds, so editing and playback stay fast. The result is cached per object.
+
+
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+import numpy as np
+
+# Seconds without changes before analysing.
+DELAY = 0.5
+# Seconds of analysis per timer call.
+TIME_SLICE = 0.02
+# Thickness is not sampled above this many triangles,
+# building the BVH tree is one step that can't be split.
+THICKNESS_TRIS_MAX = 500000
+
+# Lower bound of the suggestion relative to the largest object dimension,
+# keeps the remesh grid below about 1000 cells across.
+SIZE_MIN_FAC = 0.001
+
+
+class Suggestion:
+    """Remesh size suggested for an object and the statistics it is based on."""
+
+    __slots__ = ("remesh_size", "edge_median", "thickness_min")
+
+    def __init__(self, remesh_size, edge_median, thickness_min):
+        self.remesh_size = remesh_size
+        self.edge_median = edge_median
+        # None when the mesh has no measurable walls (e.g. open).
+        self.thickness_min = thickness_min
+
+
+# object name -> (key, Suggestion)
+_results = {}
+# name of the object to analyse once the timer runs
+_target = None
+_changed_time = 0.0
+# analysis in progress: (object name, key, step generator)
+_job = None
+
+
+def remesh_size(edge_lengths, thickness, wall, dimension):
+    """
+    Suggest a remesh (voxel) size.
+
+    - At most half the bottom wall thickness, so the shell is two voxels across.
+    - At most half the thin parts of the object (5th percentile of thickness samples).
+    - At most the median edge length, so the detail of the mesh is kept.
+    - At least SIZE_MIN_FAC of the object dimension, so the grid stays manageable.
+    """
+    thickness = thickness[np.isfinite(thickness) & (thickness > 0.0)]
+    thickness_min = float(np.percentile(thickness, 5)) if len(thickness) else None
+    edge_median = float(np.median(edge_lengths)) if len(edge_lengths) else 0.0
+
+    limits = [wall / 2.0]
+    if thickness_min is not None:
+        limits.append(thickness_min / 2.0)
+    size = min(limits)
+    if edge_median > 0.0:
+        size = min(size, edge_median)
+    size = max(size, dimension * SIZE_MIN_FAC)
+
+    return Suggestion(size, edge_median, thickness_min)
+
+
+def _key(obj, wall):
+    return (obj.data.name, tuple(map(tuple, obj.matrix_world)), wall)
+
+
+def _analyse_steps(obj, wall):
+    """Generator yielding between steps of the analysis, the Suggestion is its return value."""
+    from . import bounds, mesh_arrays, mesh_helpers
+
+    snapshot = mesh_helpers.MeshSnapshot(obj)
+    try:
+        arrays = snapshot.arrays
+        yield
+        edge_lengths = mesh_arrays.edge_lengths(snapshot.co_world, arrays.edge_verts)
+        yield
+        if len(arrays.tri_verts) <= THICKNESS_TRIS_MAX:
+            thickness = yield from mesh_helpers.mesh_thickness_samples_steps(
+                arrays, snapshot.co_world)
+        else:
+            thickness = np.zeros(0)
+    finally:
+        snapshot.free()
+
+    box_min, box_max = bounds.world_bounds((obj,))[0]
+    return remesh_size(edge_lengths, thickness, wall, float((box_max - box_min).max()))
+
+
+def get(obj, wall):
+    """Return the cached Suggestion for the object or None when not analysed (yet)."""
+    if obj is None or obj.type != 'MESH':
+        return None
+    item = _results.get(obj.name)
+    if item is None or item[0] != _key(obj, wall):
+        return None
+    return item[1]
+
+
+def _redraw():
+    # The bottom mesh panel is in the properties editor.
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PROPERTIES':
+                area.tag_redraw()
+
+
+def _timer():
+    global _target, _job
+
+    wall = bpy.context.scene.stk_tools_props.bottom_thinning_float
+
+    if _job is None:
+        wait = _changed_time + DELAY - time.monotonic()
+        if wait > 0.0:
+            # Changes are still coming in.
+            return wait
+
+        obj = bpy.data.objects.get(_target) if _target else None
+        _target = None
+        if obj is None or obj.type != 'MESH' or obj.mode != 'OBJECT' or get(obj, wall):
+            return None
+        _job = (obj.name, _key(obj, wall), _analyse_steps(obj, wall))
+
+    name, key, steps = _job
+    obj = bpy.data.objects.get(name)
+    if obj is None or obj.type != 'MESH' or obj.mode != 'OBJECT' or _key(obj, wall) != key:
+        # Changed while analysing, start over for the current target.
+        steps.close()
+        _job = None
+        return DELAY if _target else None
+
+    time_end = time.monotonic() + TIME_SLICE
+    try:
+        while time.monotonic() < time_end:
+            next(steps)
+    except StopIteration as ex:
+        _results[name] = (key, ex.value)
+        _job = None
+        _redraw()
+        return DELAY if _target else None
+    return 0.01
+
+
+@persistent
+def remesh_suggestion(scene, depsgraph):
+    global _target, _changed_time, _job
+
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            name = update.id.original.name
+            _results.pop(name, None)
+            if _job is not None and _job[0] == name:
+                _job[2].close()
+                _job = None
+
+    selected_objects = bpy.context.selected_objects
+    if not selected_objects:
+        return
+    obj = selected_objects[-1]
+    # Edit-mode is skipped, reading the edit-mesh would trigger another update.
+    if obj.type != 'MESH' or obj.mode != 'OBJECT':
+        return
+    if get(obj, scene.stk_tools_props.bottom_thinning_float):
+        return
+
+    _target = obj.name
+    _changed_time = time.monotonic()
+    if not bpy.app.timers.is_registered(_timer):
+        bpy.app.timers.register(_timer, first_interval=DELAY)
+
+
+def unregister():
+    global _target, _job
+
+    if bpy.app.timers.is_registered(_timer):
+        bpy.app.timers.unregister(_timer)
+    if _job is not None:
+        _job[2].close()
+        _job = None
+    _results.clear()
+    _target = None
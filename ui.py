@@ -1,7 +1,6 @@
 from bpy.types import Panel
-import bmesh
 
-from . import (report, utils)
+from . import (bounds, modifiers, report, suggestion, utils)
 
 
 class STKHelperPanel3DView:
@@ -22,14 +21,14 @@ class VIEW3D_PT_stk_tools_analyze(STKHelperPanel3DView, Panel):
     bl_options = {"DEFAULT_CLOSED"}
 
     _type_to_icon = {
-        bmesh.types.BMVert: 'VERTEXSEL',
-        bmesh.types.BMEdge: 'EDGESEL',
-        bmesh.types.BMFace: 'FACESEL',
+        'VERT': 'VERTEXSEL',
+        'EDGE': 'EDGESEL',
+        'FACE': 'FACESEL',
     }
 
     def draw_report(self, context):
         layout = self.layout
-        info = report.info()
+        info = report.info(context.active_object)
 
         if info:
             is_edit = context.edit_object is not None
@@ -38,13 +37,35 @@ class VIEW3D_PT_stk_tools_analyze(STKHelperPanel3DView, Panel):
             box = layout.box()
             col = box.column()
 
-            for i, (text, data) in enumerate(info):
-                if is_edit and data and data[1]:
-                    bm_type, _bm_array = data
-                    col.operator("mesh.stk_tools_select_report", text=text,
-                                 icon=self._type_to_icon[bm_type],).index = i
+            for i, entry in enumerate(info):
+                if is_edit and len(entry):
+                    col.operator("mesh.stk_tools_select_report", text=entry.text,
+                                 icon=self._type_to_icon[entry.elem_type],).index = i
                 else:
-                    col.label(text=text)
+                    col.label(text=entry.text)
+
+    def draw_batch(self, context):
+        layout = self.layout
+        rows = report.batch_info()
+
+        if rows:
+            stk_tools_props = context.scene.stk_tools_props
+            sort_key = stk_tools_props.batch_sort.lower()
+
+            layout.label(text="批量检查")
+            row = layout.row(align=True)
+            row.prop(stk_tools_props, "batch_sort", text="")
+            row.prop(stk_tools_props, "batch_sort_reverse")
+            box = layout.box()
+            col = box.column(align=True)
+
+            for data in sorted(rows, key=lambda data: data[sort_key],
+                               reverse=stk_tools_props.batch_sort_reverse):
+                row = col.row()
+                row.label(text=data["name"],
+                          icon='ERROR' if data["issues"] else 'CHECKMARK')
+                row.label(text=f"问题: {data['issues']}")
+                row.label(text=f"体积: {round(data['volume'], 4)}")
 
     def draw(self, context):
         layout = self.layout
@@ -77,9 +98,12 @@ class VIEW3D_PT_stk_tools_analyze(STKHelperPanel3DView, Panel):
         row = col.row(align=True)
         row.operator("mesh.stk_tools_check_overhang", text="外悬")
         row.prop(stk_tools_props, "angle_overhang", text="")
+        layout.prop(stk_tools_props, "use_check_attributes")
         layout.operator("mesh.stk_tools_check_all", text="检查模型的所有项目")
+        layout.operator("mesh.stk_tools_check_batch", text="批量检查所选物体")
 
         self.draw_report(context)
+        self.draw_batch(context)
 
 
 class VIEW3D_PT_stk_tools_cleanup(STKHelperPanel3DView, Panel):
@@ -163,6 +187,7 @@ class VIEW3D_PT_stk_tools_model_handle(STKHelperPanel3DView, Panel):
         col.label(text="减薄/增厚(正增负减)", icon='HOLDOUT_OFF')
 
         col.prop(stk_tools_props, "thinning_float")
+        col.prop(stk_tools_props, "thinning_even_offset")
         col.operator("object.thinning_object")
 
         col.label(text="底部 Mesh", icon='MESH_TORUS')
@@ -170,17 +195,43 @@ class VIEW3D_PT_stk_tools_model_handle(STKHelperPanel3DView, Panel):
         selected_objects = context.selected_objects
         if selected_objects:
             col.prop(stk_tools_props, "bottom_thinning_float")
-            selected_object_bounds = utils.get_bounds(selected_objects[-1])
-            tmp_plane_x = selected_object_bounds[1] - selected_object_bounds[0]
-            tmp_plane_y = selected_object_bounds[3] - selected_object_bounds[2]
+            # cached, only recomputed when objects move or change
+            box_min, box_max = bounds.world_bounds(selected_objects)[-1]
+            tmp_plane_x, tmp_plane_y, tmp_plane_z = (box_max - box_min).tolist()
             col.label(text=f"目标物体: [{selected_objects[-1].name}]")
             col.label(
                 text=f"覆盖物体面长宽: {round(tmp_plane_x,4)} x {round(tmp_plane_y,4)}")
-            col.label(
-                text=f"结构最小单元建议: {round((tmp_plane_y, tmp_plane_x)[tmp_plane_y>tmp_plane_x] * 0.01,4)}")
+            remesh_suggestion = suggestion.get(
+                selected_objects[-1], stk_tools_props.bottom_thinning_float)
+            if remesh_suggestion is None:
+                col.label(text="结构最小单元建议: 分析中...")
+            else:
+                col.label(
+                    text=f"结构最小单元建议: {round(remesh_suggestion.remesh_size, 4)}")
+                thickness_min = remesh_suggestion.thickness_min
+                col.label(
+                    text=f"边长中位数: {round(remesh_suggestion.edge_median, 4)}, "
+                    f"最薄处: {'-' if thickness_min is None else round(thickness_min, 4)}")
             col.label(
                 text=f"若有处理后存在破洞-【最小单元】需稍小")
             col.prop(stk_tools_props, "bottom_remesh_float")
+            col.prop(stk_tools_props, "bottom_final_remesh")
+            if stk_tools_props.bottom_final_remesh:
+                # top and bottom of the shell over the covered area
+                estimate = modifiers.remesh_estimate(
+                    (tmp_plane_x * 1.1, tmp_plane_y * 1.1, tmp_plane_z),
+                    max(stk_tools_props.bottom_remesh_float, 1e-6),
+                    area=2.0 * tmp_plane_x * tmp_plane_y * 1.21,
+                )
+                col.label(
+                    text=f"预计: {estimate.faces} 面, "
+                    f"{round(estimate.memory / 2 ** 20)} MB, {round(estimate.seconds, 1)} 秒",
+                    icon='ERROR' if estimate.over_budget(
+                        stk_tools_props.remesh_memory_budget * 2 ** 20,
+                        stk_tools_props.remesh_faces_budget) > 1.0 else 'NONE')
+                col.prop(stk_tools_props, "remesh_budget_mode")
+                col.prop(stk_tools_props, "remesh_memory_budget")
+                col.prop(stk_tools_props, "remesh_faces_budget")
             col.operator("objects.santouka_business_mesh_bottom")
         else:
             col.label(text="没有选择物体! 请选择一个物体")